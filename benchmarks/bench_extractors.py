@@ -0,0 +1,80 @@
+"""Benchmark the detail page extraction backends.
+
+Times every installed backend in `main.DETAIL_EXTRACTORS` on the same set
+of pages and reports CPU time per page and how many pages give the same
+fields as BeautifulSoup. Pass recorded detail pages as arguments, or run
+without arguments to use synthetic pages; every other one carries extra
+classes on the blocks the fields come from, as real pages may:
+
+    python benchmarks/bench_extractors.py [page.html ...] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from sample_pages import render_detail_page  # noqa: E402
+
+
+# Extra classes added to the detail blocks of every other synthetic page
+MULTI_CLASS = {
+    'class="pageTitle"': 'class="pageTitle clearfix"',
+    'class="subtitle"': 'class="subtitle lead"',
+    'class="event-detail-wrap"': 'class="row event-detail-wrap"',
+    'class="event-detail-float"': 'class="event-detail-float col-md-4"',
+    'class="place"': 'class="place text-muted"',
+}
+
+
+def with_multiple_classes(page):
+    for single, multiple in MULTI_CLASS.items():
+        page = page.replace(single, multiple)
+    return page
+
+
+def load_pages(paths, count):
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                pages.append(f.read())
+        return pages
+    pages = [
+        render_detail_page(100000 + i, speaker=f'Speaker {i}',
+                           youtube_link='https://youtu.be/abc123' if i % 3 == 0 else None)
+        for i in range(count)
+    ]
+    return [with_multiple_classes(page) if i % 2 else page for i, page in enumerate(pages)]
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('pages', nargs='*', help='recorded detail pages (HTML files)')
+    parser.add_argument('--count', type=int, default=50, help='number of synthetic pages (default: 50)')
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the pages per backend (default: 3)')
+    args = parser.parse_args(argv)
+
+    pages = load_pages(args.pages, args.count)
+    average_size = sum(len(page) for page in pages) / len(pages)
+    print(f"{len(pages)} pages, {average_size / 1024:.0f} KiB on average\n")
+
+    expected = [main.extract_detail_fields_soup(page) for page in pages]
+    print(f"{'backend':<12}{'ms/page':>10}{'speedup':>10}  matches soup")
+    baseline = None
+    for name in reversed(list(main.DETAIL_EXTRACTORS)):
+        extract = main.DETAIL_EXTRACTORS[name]
+        start = time.process_time()
+        for _ in range(args.repeat):
+            results = [extract(page) for page in pages]
+        per_page = (time.process_time() - start) / (args.repeat * len(pages)) * 1000
+        baseline = baseline or per_page
+        matches = sum(result == want for result, want in zip(results, expected))
+        print(f"{name:<12}{per_page:>10.2f}{baseline / per_page:>9.1f}x  {matches}/{len(pages)}")
+
+
+if __name__ == '__main__':
+    run()
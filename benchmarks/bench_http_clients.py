@@ -0,0 +1,84 @@
+"""Compare the scraper's HTTP client backends against the local stand-in.
+
+Runs `main.py` once per backend, the per-thread requests sessions and the
+shared httpx client of `--http2`, and reports wall time, requests per
+second and how many TCP connections the stand-in accepted. Options after
+`--` are passed to every run, e.g.:
+
+    python benchmarks/bench_http_clients.py --latency 0.02 -- --detail-workers 16 --requests-per-second 0
+
+The stand-in serves cleartext HTTP/1.1, and httpx only negotiates HTTP/2
+over TLS, so here `--http2` measures the httpx client itself; multiplexing
+only comes into play against real HTTPS servers.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+from bench_pipeline import run_scraper  # noqa: E402
+from standin_server import add_site_arguments, site_from_args, start_servers  # noqa: E402
+
+BACKENDS = {
+    'requests': [],
+    'httpx': ['--http2'],
+}
+
+
+def run(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    extra_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, extra_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_site_arguments(parser)
+    parser.add_argument('--runs', type=int, default=3, help='runs per backend, best one counts (default: 3)')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON to PATH')
+    args = parser.parse_args(argv)
+    if main.httpx is None:
+        sys.exit("httpx is not installed, install it with: pip install 'httpx[http2]'")
+
+    site = site_from_args(args, main.FEED_IDS)
+    servers, events_url, lsa_url = start_servers(site)
+    results = {}
+    try:
+        for backend, backend_args in BACKENDS.items():
+            runs = []
+            for _ in range(args.runs):
+                site.reset_counters()
+                with tempfile.TemporaryDirectory() as workdir:
+                    completed, wall = run_scraper(events_url, lsa_url, site, workdir,
+                                                  ['--no-cache', *backend_args, *extra_args])
+                if completed.returncode != 0:
+                    print(completed.stdout)
+                    sys.exit(f"main.py exited with status {completed.returncode}")
+                total_requests = sum(site.requests.values())
+                runs.append({
+                    'wall_seconds': round(wall, 3),
+                    'requests': total_requests,
+                    'requests_per_second': round(total_requests / wall, 2),
+                    'connections': site.connections,
+                })
+            results[backend] = min(runs, key=lambda r: r['wall_seconds'])
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    for backend, result in results.items():
+        print(f"{backend:>8}: {result['wall_seconds']:.2f}s wall, {result['requests']} requests "
+              f"({result['requests_per_second']:.1f}/s) over {result['connections']} connections")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'site': vars(args), 'scraper_args': extra_args, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,107 @@
+"""End-to-end throughput benchmark of the scraper against the local stand-in.
+
+Starts the stand-in servers, runs `main.py` in a subprocess for the whole
+synthetic date range and reports wall time, requests per second, bytes
+served and the peak RSS of the scraper process. Options after `--` are
+passed to main.py, e.g.:
+
+    python benchmarks/bench_pipeline.py --latency 0.1 -- --detail-workers 16 --requests-per-second 0
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402
+from standin_server import add_site_arguments, site_from_args, start_servers  # noqa: E402
+
+
+def peak_child_rss_mib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_scraper(events_url, lsa_url, site, workdir, extra_args):
+    start = site.first_day.strftime('%m/%d/%y')
+    end = (site.first_day + timedelta(days=site.days)).strftime('%m/%d/%y')
+    command = [sys.executable, os.path.join(ROOT, 'main.py'),
+               '--start', start, '--end', end,
+               '--events-base-url', events_url, '--lsa-base-url', lsa_url,
+               '--cache-dir', os.path.join(workdir, 'cache'), *extra_args]
+    started = time.perf_counter()
+    completed = subprocess.run(command, text=True, cwd=workdir, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - started
+    return completed, wall
+
+
+def run(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    extra_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, extra_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_site_arguments(parser)
+    parser.add_argument('--runs', type=int, default=1,
+                        help='consecutive runs sharing one cache directory, to measure warm runs (default: 1)')
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON to PATH')
+    parser.add_argument('--show-output', action='store_true', help="print the scraper's own output")
+    args = parser.parse_args(argv)
+
+    site = site_from_args(args, main.FEED_IDS)
+    servers, events_url, lsa_url = start_servers(site)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            for run_number in range(1, args.runs + 1):
+                site.reset_counters()
+                completed, wall = run_scraper(events_url, lsa_url, site, workdir, extra_args)
+                if args.show_output or completed.returncode != 0:
+                    print(completed.stdout)
+                if completed.returncode != 0:
+                    sys.exit(f"main.py exited with status {completed.returncode}")
+                total_requests = sum(site.requests.values())
+                results.append({
+                    'run': run_number,
+                    'wall_seconds': round(wall, 3),
+                    'requests': dict(site.requests),
+                    'requests_per_second': round(total_requests / wall, 2),
+                    'bytes_served': site.bytes_sent,
+                    'peak_rss_mib': peak_child_rss_mib(),
+                })
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    for result in results:
+        peak = result['peak_rss_mib']
+        print(f"run {result['run']}: {result['wall_seconds']:.2f}s wall, "
+              f"{sum(result['requests'].values())} requests ({result['requests_per_second']:.1f}/s), "
+              f"{result['bytes_served'] / 1024:.0f} KiB served, "
+              f"peak RSS {'n/a' if peak is None else f'{peak:.0f} MiB'}")
+        print(f"       {', '.join(f'{kind}={count}' for kind, count in sorted(result['requests'].items()))}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'site': vars(args), 'scraper_args': extra_args, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    run()
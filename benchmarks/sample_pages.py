@@ -0,0 +1,146 @@
+"""Synthetic feeds and pages in the markup the scraper expects from the live sites.
+
+Used by the benchmarks so they can run without touching events.umich.edu
+or lsa.umich.edu. The detail page mimics an LSA event page: a large
+navigation header, the three blocks `fetch_event_detail_page` reads, and
+a footer with scripts.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from xml.sax.saxutils import escape
+
+NAV_LINKS = 400
+FOOTER_SCRIPTS = 12
+
+
+def _navigation(rng):
+    items = []
+    for i in range(NAV_LINKS):
+        items.append(
+            f'<li class="nav-item"><a href="/physics/section-{i}.html" '
+            f'data-track="nav-{i}">Section {i} {rng.choice(["People", "Research", "Courses", "News"])}</a></li>'
+        )
+    return '<header class="site-header"><nav><ul class="nav">' + ''.join(items) + '</ul></nav></header>'
+
+
+def _footer():
+    scripts = ''.join(
+        f'<script type="text/javascript">window.analytics_{i} = {{"id": {i}, "payload": "{"x" * 800}"}};</script>'
+        for i in range(FOOTER_SCRIPTS)
+    )
+    return (
+        '<footer class="site-footer"><div class="footer-links">'
+        + ''.join(f'<a href="/footer-{i}.html">Footer link {i}</a>' for i in range(60))
+        + '</div></footer>' + scripts
+    )
+
+
+def render_detail_page(guid, speaker='Jane Doe', place='Randall Laboratory 1010',
+                       youtube_link=None, seed=None):
+    """Return the HTML of an event detail page for `guid`."""
+    rng = random.Random(seed if seed is not None else guid)
+    livestream = f'<p>Livestream: {youtube_link}</p>' if youtube_link else ''
+    description = ''.join(
+        f'<p>Abstract paragraph {i} for event {guid}. '
+        + ' '.join(rng.choice(['quantum', 'lattice', 'spin', 'field', 'dark', 'matter']) for _ in range(40))
+        + '</p>'
+        for i in range(4)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="UTF-8"><title>Event</title>'
+        '<link rel="stylesheet" href="/styles/site.css"></head><body>'
+        + _navigation(rng)
+        + '<main><div class="pageTitle"><h1>Physics Seminar</h1>'
+        f'<div class="subtitle">{speaker}</div></div>'
+        '<div class="event-detail-wrap"><div class="event-detail-float">'
+        '<div class="date">Monday, January 12, 2026</div>'
+        f'<div class="place">{place}</div></div>'
+        f'<div class="description-wrap">{description}{livestream}</div></div></main>'
+        + _footer()
+        + '</body></html>'
+    )
+
+
+EASTERN = timezone(timedelta(hours=-5))
+TOPICS = ['Condensed Matter', 'Cosmology', 'High Energy', 'Biophysics', 'Quantum Optics', 'Atomic Physics']
+SPEAKERS = ['Jane Doe', 'Ravi Patel', 'Mei Chen', 'Carlos Ruiz', 'Anna Novak', 'Kwame Mensah']
+PLACES = ['Randall Laboratory 1010', 'West Hall 340', 'Weiser Hall 10th floor', 'Ross School R2240']
+
+
+def make_event(guid, start, described=True, youtube=False):
+    """Return the fields of one synthetic event starting at `start`."""
+    rng = random.Random(guid)
+    speaker = rng.choice(SPEAKERS)
+    place = rng.choice(PLACES)
+    return {
+        'guid': guid,
+        'title': f"{rng.choice(TOPICS)} Seminar | Topic {guid}",
+        'start': start,
+        'end': start + timedelta(hours=1),
+        'speaker': speaker,
+        'place': place,
+        'described': described,
+        'youtube_link': f'https://youtu.be/v{guid}' if youtube else None,
+    }
+
+
+def schedule_events(count, first_day, days, seed=0, described_fraction=0.5, youtube_fraction=0.2):
+    """Return `count` events spread over `days` days from `first_day`.
+
+    A `described_fraction` of them carry speaker and location in their
+    feed description, so the enrichment planner can skip their detail page.
+    """
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        day = first_day + timedelta(days=rng.randrange(days))
+        start = datetime(day.year, day.month, day.day, rng.choice([10, 12, 14, 16]), rng.choice([0, 30]),
+                         tzinfo=EASTERN)
+        events.append(make_event(100000 + seed * 10000 + i, start,
+                                 described=rng.random() < described_fraction,
+                                 youtube=rng.random() < youtube_fraction))
+    return events
+
+
+def _description(event):
+    lines = []
+    if event['described']:
+        lines.append(f"<p>{event['speaker']} (University of Somewhere)</p>")
+        lines.append(f"<p>In-person: {event['place']}, 450 Church St</p>")
+    else:
+        lines.append('<p>Please join us for this week\'s seminar.</p>')
+    if event['youtube_link']:
+        lines.append(f"<p>Livestream: {event['youtube_link']}</p>")
+    return '\n'.join(lines)
+
+
+def render_group_feed(events):
+    """Return a group RSS feed (v=2, html_output=true) listing `events`."""
+    items = []
+    for event in events:
+        start_label = event['start'].strftime('%B %d, %Y %I:%M%p').replace(' 0', ' ').lower()
+        start_label = start_label[0].upper() + start_label[1:]
+        items.append(
+            '<item>'
+            f"<title>{escape(event['title'])} ({escape(start_label)})</title>"
+            f"<link>https://events.umich.edu/event/{event['guid']}</link>"
+            f"<guid>{event['guid']}@events.umich.edu</guid>"
+            f"<description><![CDATA[{_description(event)}]]></description>"
+            '<category>Lecture / Discussion</category>'
+            f"<pubDate>{event['start'].strftime('%a, %d %b %Y %H:%M:%S %z')}</pubDate>"
+            f"<ev:startdate>{event['start'].isoformat()}</ev:startdate>"
+            f"<ev:enddate>{event['end'].isoformat()}</ev:enddate>"
+            f"<ev:location>{escape(event['place'])}</ev:location>"
+            '<ev:organizer>Department of Physics</ev:organizer>'
+            '<ev:type>Lecture / Discussion</ev:type>'
+            '</item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:ev="http://purl.org/rss/1.0/modules/event/" '
+        'xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        '<title>Physics group feed</title><link>https://events.umich.edu/</link>'
+        + ''.join(items)
+        + '</channel></rss>'
+    )
@@ -0,0 +1,261 @@
+"""Local stand-in for events.umich.edu and lsa.umich.edu.
+
+Serves synthetic group feeds and event detail pages in the markup that
+`parse_rss_feed` and `fetch_event_detail_page` expect, with configurable
+item counts, latency and error rates. Two servers are started on separate
+ports so the scraper sees two hosts, as it does in production. Run it on
+its own to point a manual run at it:
+
+    python benchmarks/standin_server.py --items-per-feed 60 --latency 0.1
+    python main.py --events-base-url http://127.0.0.1:8801 --lsa-base-url http://127.0.0.1:8802
+"""
+
+import argparse
+import hashlib
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sample_pages import render_detail_page, render_group_feed, schedule_events
+
+FEED_PATH_RE = re.compile(r'^/group/(\d+)/rss')
+DETAIL_PATH_RE = re.compile(r'^/physics/news-events/all-events\.detail\.html/(\d+)\.html')
+
+
+class StandinSite:
+    """Synthetic content and counters shared by both stand-in servers.
+
+    Every feed lists `items_per_feed` events. A `shared_fraction` of them
+    also appear in the other feeds, like seminars cross-listed by several
+    groups. Each response waits `latency` seconds, plus up to `jitter` more,
+    and fails with 503 with probability `error_rate`. With probability
+    `slow_rate` a detail page trickles in over `slow_seconds`, like the
+    long tail of a busy production server. A `capacity` above 0 is the
+    number of requests each host serves at once; requests beyond it are
+    refused with 503 like an overloaded server would.
+    """
+
+    def __init__(self, feed_ids, items_per_feed=40, first_day=None, days=28, shared_fraction=0.3,
+                 described_fraction=0.5, latency=0.05, jitter=0.05, error_rate=0.0, slow_rate=0.0,
+                 slow_seconds=5.0, capacity=0, seed=0):
+        self.first_day = first_day or date.today()
+        self.days = days
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self.capacity = capacity
+        self.in_flight = Counter()
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self.connections = 0
+
+        shared_count = int(items_per_feed * shared_fraction)
+        shared = schedule_events(shared_count, self.first_day, days, seed=seed + 1,
+                                 described_fraction=described_fraction)
+        self.events = {event['guid']: event for event in shared}
+        self.feeds = {}
+        for index, feed_id in enumerate(feed_ids):
+            own = schedule_events(items_per_feed - shared_count, self.first_day, days, seed=seed + 2 + index,
+                                  described_fraction=described_fraction)
+            self.events.update((event['guid'], event) for event in own)
+            body = render_group_feed(sorted(shared + own, key=lambda e: e['start'])).encode('utf-8')
+            self.feeds[str(feed_id)] = (body, '"%s"' % hashlib.sha1(body).hexdigest()[:16])
+
+    def delay_and_fail(self):
+        """Sleep for the configured latency; return True if this request should fail."""
+        with self.lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            fail = self.rng.random() < self.error_rate
+        time.sleep(delay)
+        return fail
+
+    def enter(self, port):
+        """Start serving a request on the server at `port`; False if it is over capacity."""
+        with self.lock:
+            if self.capacity and self.in_flight[port] >= self.capacity:
+                self.requests['overloaded'] += 1
+                return False
+            self.in_flight[port] += 1
+            return True
+
+    def leave(self, port):
+        with self.lock:
+            self.in_flight[port] -= 1
+
+    def drip_seconds(self):
+        """Return the seconds a detail page body should be spread over (0 to send it at once)."""
+        with self.lock:
+            return self.slow_seconds if self.rng.random() < self.slow_rate else 0.0
+
+    def count(self, kind, sent):
+        with self.lock:
+            self.requests[kind] += 1
+            self.bytes_sent += sent
+
+    def connected(self):
+        with self.lock:
+            self.connections += 1
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests.clear()
+            self.bytes_sent = 0
+            self.connections = 0
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that stop reading early reset the connection; that is expected
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; like real servers, send
+        # them without waiting for the client to acknowledge the first
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def setup(self):
+            # Called once per client connection, however many requests it carries
+            site.connected()
+            super().setup()
+
+        def send_body(self, kind, status, body=b'', content_type='text/html; charset=UTF-8', headers=None,
+                      drip=0.0):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            try:
+                if drip:
+                    pieces = 20
+                    step = len(body) // pieces + 1
+                    for start in range(0, len(body), step):
+                        self.wfile.write(body[start:start + step])
+                        self.wfile.flush()
+                        time.sleep(drip / pieces)
+                else:
+                    self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The scraper stops reading detail pages early
+                pass
+            site.count(kind, len(body))
+
+        def do_GET(self):
+            port = self.server.server_address[1]
+            if not site.enter(port):
+                self.send_body('error', 503, b'Service Unavailable')
+                return
+            try:
+                self.serve()
+            finally:
+                site.leave(port)
+
+        def serve(self):
+            if site.delay_and_fail():
+                self.send_body('error', 503, b'Service Unavailable', headers={'Retry-After': '1'})
+                return
+            feed = FEED_PATH_RE.match(self.path)
+            if feed and feed.group(1) in site.feeds:
+                body, etag = site.feeds[feed.group(1)]
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_body('feed_not_modified', 304, headers={'ETag': etag})
+                else:
+                    self.send_body('feed', 200, body, 'application/rss+xml; charset=UTF-8', {'ETag': etag})
+                return
+            detail = DETAIL_PATH_RE.match(self.path)
+            if detail and int(detail.group(1)) in site.events:
+                event = site.events[int(detail.group(1))]
+                body = render_detail_page(event['guid'], event['speaker'], event['place'],
+                                          event['youtube_link']).encode('utf-8')
+                self.send_body('detail', 200, body, drip=site.drip_seconds())
+                return
+            self.send_body('not_found', 404, b'Not Found')
+
+    return Handler
+
+
+def start_servers(site, host='127.0.0.1', events_port=0, lsa_port=0):
+    """Start the events and LSA stand-ins in background threads.
+
+    Returns (servers, events_base_url, lsa_base_url). Call `shutdown()` on
+    each server when done.
+    """
+    servers = []
+    for port in (events_port, lsa_port):
+        server = StandinServer((host, port), make_handler(site))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    events_url, lsa_url = (f'http://{host}:{server.server_address[1]}' for server in servers)
+    return servers, events_url, lsa_url
+
+
+def add_site_arguments(parser):
+    parser.add_argument('--items-per-feed', type=int, default=40, help='events listed in each feed (default: 40)')
+    parser.add_argument('--days', type=int, default=28, help='days the events are spread over (default: 28)')
+    parser.add_argument('--shared-fraction', type=float, default=0.3,
+                        help='fraction of each feed shared with every other feed (default: 0.3)')
+    parser.add_argument('--described-fraction', type=float, default=0.5,
+                        help='fraction of events whose feed item names speaker and location (default: 0.5)')
+    parser.add_argument('--latency', type=float, default=0.05, help='base seconds per response (default: 0.05)')
+    parser.add_argument('--jitter', type=float, default=0.05, help='extra random seconds per response (default: 0.05)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of a 503 response (default: 0)')
+    parser.add_argument('--slow-rate', type=float, default=0.0,
+                        help='probability that a detail page trickles in slowly (default: 0)')
+    parser.add_argument('--slow-seconds', type=float, default=5.0,
+                        help='seconds a slow detail page takes to send (default: 5)')
+    parser.add_argument('--capacity', type=int, default=0,
+                        help='requests each host serves at once before refusing with 503; 0 is unlimited (default: 0)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the synthetic content (default: 0)')
+
+
+def site_from_args(args, feed_ids):
+    return StandinSite(feed_ids, items_per_feed=args.items_per_feed, days=args.days,
+                       shared_fraction=args.shared_fraction, described_fraction=args.described_fraction,
+                       latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                       slow_rate=args.slow_rate, slow_seconds=args.slow_seconds, capacity=args.capacity,
+                       seed=args.seed)
+
+
+def run(argv=None):
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import main
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events-port', type=int, default=8801, help='port of the events stand-in (default: 8801)')
+    parser.add_argument('--lsa-port', type=int, default=8802, help='port of the LSA stand-in (default: 8802)')
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+
+    site = site_from_args(args, main.FEED_IDS)
+    servers, events_url, lsa_url = start_servers(site, events_port=args.events_port, lsa_port=args.lsa_port)
+    print(f"Events stand-in: {events_url}\nLSA stand-in:    {lsa_url}\nPress Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    run()
@@ -1,205 +1,2366 @@
 import requests
 import xml.etree.ElementTree as ET
-from datetime import datetime, timezone
-from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict, Counter, deque
+from contextlib import contextmanager
 import sys
 import re
+import math
 import os
 import csv
+import json
+import hashlib
+import codecs
+import sqlite3
+from functools import partial
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup, SoupStrainer
 import time
 import random
+import argparse
+import threading
+import queue
+import socket
+import importlib.util
+import itertools
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from urllib.parse import urlparse, urlsplit, urlunsplit
+from email.utils import parsedate_to_datetime
 
+# Optional faster HTML parsers for detail pages
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxHTMLParser
+    except ImportError:
+        SelectolaxHTMLParser = None
+try:
+    import httpx
+except ImportError:
+    httpx = None
+# httpx negotiates HTTP/2 only when the h2 package is installed too
+HTTP2_AVAILABLE = httpx is not None and importlib.util.find_spec('h2') is not None
+
+
+# Browser-like headers sent with every request
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0',
+}
+
+
+# Configure session with browser-like headers
+def create_session(adapter=None):
+    """Create a requests session with browser-like headers.
+
+    If `adapter` is given it serves both http and https, so sessions can
+    share its connection pool.
+    """
+    session = requests.Session()
+    session.headers.update(BROWSER_HEADERS)
+    if adapter:
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
+
+
+def create_adapter(pool_size):
+    """Create a thread-safe HTTP adapter keeping up to `pool_size` connections per host.
+
+    Retries are left to `fetch_with_retries`.
+    """
+    return requests.adapters.HTTPAdapter(pool_maxsize=pool_size, max_retries=0)
+
+
+@contextmanager
+def requests_errors_from_httpx():
+    """Re-raise httpx errors as the requests exceptions the fetch layer handles."""
+    try:
+        yield
+    except httpx.TimeoutException as e:
+        raise requests.Timeout(str(e)) from e
+    except httpx.HTTPError as e:
+        raise requests.ConnectionError(str(e)) from e
+
+
+class HttpxResponse:
+    """The part of the requests.Response API the scraper uses, over an httpx response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.url = str(response.url)
+        # Same default as requests, e.g. ISO-8859-1 for text/* without a charset
+        self.encoding = requests.utils.get_encoding_from_headers(response.headers)
+
+    @property
+    def content(self):
+        with requests_errors_from_httpx():
+            return self.response.read()
+
+    def iter_content(self, chunk_size):
+        with requests_errors_from_httpx():
+            yield from self.response.iter_bytes(chunk_size)
+
+    def close(self):
+        self.response.close()
+
+
+class HttpxSession:
+    """A thread-safe httpx client behind the `get` call of a requests session.
+
+    It speaks HTTP/2 where the server offers it (over TLS, when the h2
+    package is installed), multiplexing concurrent requests to a host over
+    one connection, and HTTP/1.1 otherwise. Up to `pool_size` idle
+    connections are kept alive.
+    """
+
+    def __init__(self, pool_size):
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=pool_size)
+        self.client = httpx.Client(http2=HTTP2_AVAILABLE, headers=BROWSER_HEADERS, limits=limits)
+
+    def get(self, url, timeout=None, headers=None, stream=False):
+        with requests_errors_from_httpx():
+            request = self.client.build_request('GET', url, headers=headers, timeout=timeout)
+            return HttpxResponse(self.client.send(request, stream=stream))
+
+    def close(self):
+        self.client.close()
+
+
+class HttpClients:
+    """Hands out the HTTP client for the calling thread.
+
+    A requests.Session is not safe to share between threads, so with the
+    default backend every thread gets its own session. They all mount one
+    adapter whose connection pool holds `pool_size` connections per host,
+    the most requests that can be in flight to a host, so no connection is
+    dropped for lack of a pool slot. With `http2`, all threads share one
+    HttpxSession instead.
+    """
+
+    def __init__(self, pool_size):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.adapter = None
+        self.shared = None
+        self.generation = 0
+        self.configure(pool_size)
+
+    def configure(self, pool_size, http2=False):
+        """Set the pool size and backend; sessions made before are replaced on next use."""
+        with self.lock:
+            for client in (self.adapter, self.shared):
+                if client:
+                    client.close()
+            self.adapter = None if http2 else create_adapter(pool_size)
+            self.shared = HttpxSession(pool_size) if http2 else None
+            self.generation += 1
+
+    def session(self):
+        """Return the client the calling thread should use."""
+        if self.shared:
+            return self.shared
+        if getattr(self.local, 'generation', None) != self.generation:
+            self.local.session = create_session(self.adapter)
+            self.local.generation = self.generation
+        return self.local.session
+
+
+# Global source of HTTP clients for all fetches
+HTTP_CLIENTS = HttpClients(pool_size=10)
+
+# Group feeds aggregated into the digest
+FEED_IDS = [1965, 1178, 3798, 3799, 3767, 3801, 3811, 3247, 3804, 3805, 3806, 3807, 3813, 4897, 3606, 5034]
+
+# Sites the scraper talks to. They can be pointed at a local stand-in
+# server (see benchmarks/standin_server.py) with set_site_urls().
+EVENTS_BASE_URL = 'https://events.umich.edu'
+LSA_BASE_URL = 'https://lsa.umich.edu'
+FEED_URL_TEMPLATE = "{base}/group/{feed_id}/rss?v=2&html_output=true"
+EVENT_URL_TEMPLATE = "{base}/physics/news-events/all-events.detail.html/{guid}.html"
+
+# Number of group feeds fetched at the same time
+DEFAULT_FEED_CONCURRENCY = 8
+
+# Number of event detail pages fetched at the same time
+DEFAULT_DETAIL_WORKERS = 4
+
+# Capacity of each queue between the stages of --pipeline mode
+DEFAULT_QUEUE_SIZE = 64
+
+# Politeness limits, applied separately to each host
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_BURST = 4
+
+REQUEST_TIMEOUT = 15
+
+# Seconds a detail page may take from request to last byte, however
+# steadily it trickles in; REQUEST_TIMEOUT only bounds each wait for data
+DEFAULT_REQUEST_DEADLINE = 30.0
+
+# Attempts per request and the cap on the backoff between them
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_MAX_BACKOFF = 30.0
+
+# Consecutive failures that open a host's circuit breaker, and the seconds
+# it stays open before a trial request is let through
+DEFAULT_BREAKER_FAILURES = 5
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+# Bytes read from the network per step while streaming a feed or detail page
+FEED_CHUNK_SIZE = 16 * 1024
+DETAIL_CHUNK_SIZE = 8 * 1024
+
+# Unread bytes of an early-aborted detail page still read to keep the connection
+# alive for reuse; closing it mid-body forces a new connection for the next page
+DETAIL_DRAIN_BYTES = 32 * 1024
+
+# Hard limit on the size of a detail page
+DEFAULT_MAX_DETAIL_BYTES = 2 * 1024 * 1024
+
+# Directory the digest files are written to
+DEFAULT_OUTPUT_DIR = 'Physics Seminars & Colloquia'
+
+# Directory holding caches that persist between runs
+DEFAULT_CACHE_DIR = '.scraper-cache'
+
+# Cached detail page fields are reused without revalidation for this long
+DEFAULT_DETAIL_CACHE_TTL = 3 * 24 * 3600
+# Maximum number of detail pages kept in the cache
+DEFAULT_DETAIL_CACHE_SIZE = 5000
+
+
+def set_site_urls(events_base_url=None, lsa_base_url=None):
+    """Override the base URLs of the events feeds and the LSA detail pages."""
+    global EVENTS_BASE_URL, LSA_BASE_URL
+    if events_base_url:
+        EVENTS_BASE_URL = events_base_url.rstrip('/')
+    if lsa_base_url:
+        LSA_BASE_URL = lsa_base_url.rstrip('/')
+
+
+def percentile(sorted_values, fraction):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class RunMetrics:
+    """Timings and request statistics collected over one run.
+
+    Phases are the sequential steps of main(); spans accumulate work done
+    inside worker threads (e.g. detail page parsing). Request latency is
+    the time until response headers arrive, grouped by host. Everything is
+    safe to record from multiple threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.phases = {}
+        self.spans = defaultdict(lambda: {'count': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+        self.retries = Counter()
+        self.bytes_received = Counter()
+        self.sleep_seconds = Counter()
+        self.sections = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Time a top-level step of the run (wall and process CPU time)."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.phases[name] = {
+                'wall_seconds': time.perf_counter() - wall_start,
+                'cpu_seconds': time.process_time() - cpu_start,
+            }
+
+    @contextmanager
+    def span(self, name):
+        """Accumulate time spent on `name` in the current thread."""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            with self.lock:
+                span = self.spans[name]
+                span['count'] += 1
+                span['wall_seconds'] += wall
+                span['cpu_seconds'] += cpu
+
+    def record_request(self, url, seconds, status=None, error=None):
+        host = urlparse(url).netloc
+        with self.lock:
+            self.latencies[host].append(seconds)
+            if status is not None:
+                self.statuses[host][str(status)] += 1
+            if error is not None:
+                self.errors[f"{host} {type(error).__name__}"] += 1
+
+    def record_retry(self, url):
+        with self.lock:
+            self.retries[urlparse(url).netloc] += 1
+
+    def record_bytes(self, url, count):
+        with self.lock:
+            self.bytes_received[urlparse(url).netloc] += count
+
+    def record_sleep(self, reason, seconds):
+        with self.lock:
+            self.sleep_seconds[reason] += seconds
+
+    def set_section(self, name, data):
+        """Attach a JSON-serializable block of extra statistics to the report."""
+        with self.lock:
+            self.sections[name] = data
+
+    def report(self):
+        """Return the collected metrics as a JSON-serializable dict."""
+        with self.lock:
+            hosts = {}
+            for host in sorted(set(self.latencies) | set(self.bytes_received) | set(self.retries)):
+                latencies = sorted(self.latencies.get(host, []))
+                hosts[host] = {
+                    'requests': len(latencies),
+                    'latency_seconds': {
+                        'p50': percentile(latencies, 0.50),
+                        'p95': percentile(latencies, 0.95),
+                        'p99': percentile(latencies, 0.99),
+                        'max': latencies[-1] if latencies else None,
+                    },
+                    'statuses': dict(self.statuses.get(host, {})),
+                    'retries': self.retries.get(host, 0),
+                    'bytes_received': self.bytes_received.get(host, 0),
+                }
+            return {
+                'started': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+                'phases': dict(self.phases),
+                'spans': {name: dict(span) for name, span in self.spans.items()},
+                'hosts': hosts,
+                'errors': dict(self.errors),
+                'sleep_seconds': dict(self.sleep_seconds),
+                **self.sections,
+            }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+# Global metrics for the current run
+METRICS = RunMetrics()
+
+
+def random_delay(min_seconds=0.5, max_seconds=2.0):
+    """Add a random delay to appear more human-like."""
+    seconds = random.uniform(min_seconds, max_seconds)
+    METRICS.record_sleep('random_delay', seconds)
+    time.sleep(seconds)
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class HostRateLimiter:
+    """Rate limiter keeping a separate token bucket for each host.
+
+    events.umich.edu (feeds) and lsa.umich.edu (detail pages) are throttled
+    independently, so a burst of detail fetches never delays feed fetches.
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate=DEFAULT_REQUESTS_PER_SECOND, burst=DEFAULT_BURST):
+        self.lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst):
+        """Set the per-host rate and burst size, discarding existing buckets."""
+        with self.lock:
+            self.rate = rate
+            self.burst = burst
+            self.buckets = {}
+
+    def acquire(self, url):
+        """Wait until a request to the host of `url` is allowed. Returns the seconds spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+        host = urlparse(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket.acquire()
+
+
+# Global per-host rate limiter shared by all fetches
+RATE_LIMITER = HostRateLimiter()
+
+
+class ScraperError(Exception):
+    """Base class for errors fetching or parsing the event sites."""
+
+
+class FetchError(ScraperError):
+    """A request failed for good: retries were exhausted or not worth making."""
+
+    def __init__(self, url, message):
+        super().__init__(f"{message} ({url})")
+        self.url = url
+
+
+class CircuitOpenError(FetchError):
+    """The circuit breaker of the host is open, so no request was made."""
+
+
+class BudgetExhaustedError(FetchError):
+    """The run's time budget ran out before the request could succeed."""
+
+
+class FeedParseError(ScraperError):
+    """A group feed is not well-formed XML."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """A response was still arriving when its wall-clock deadline passed.
+
+    It is a requests Timeout, so the retry layer retries it like one.
+    """
+
+
+# Responses worth retrying: the host is overloaded or briefly unavailable.
+# Other 4xx/5xx statuses fail at once.
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter.
+
+    Retry n (from 0) sleeps a random time between 0 and
+    min(max_delay, base_delay * 2**n), which spreads retries from many
+    workers instead of having them hit a recovering host in lockstep. A
+    Retry-After header on a 429/503 response is honoured, up to `max_delay`.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=0.5, max_delay=DEFAULT_MAX_BACKOFF):
+        self.base_delay = base_delay
+        self.configure(max_attempts, max_delay)
+
+    def configure(self, max_attempts, max_delay):
+        """Set the number of attempts per request and the longest wait between them."""
+        self.max_attempts = max(1, max_attempts)
+        self.max_delay = max_delay
+
+    def delay(self, retry, response=None):
+        """Return the seconds to wait before retry number `retry`."""
+        seconds = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+        retry_after = parse_retry_after(response.headers.get('Retry-After')) if response is not None else None
+        if retry_after is not None:
+            seconds = max(seconds, min(retry_after, self.max_delay))
+        return seconds
+
+
+def parse_retry_after(value):
+    """Return the seconds a Retry-After header value (delay or HTTP date) asks for, or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """Stops requests to a host after `failure_threshold` consecutive failures.
+
+    Once open, requests are refused for `reset_timeout` seconds. After that
+    a single trial request is let through: success closes the circuit,
+    failure opens it again for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.trips = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a request may be made now."""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running or time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def cancel_trial(self):
+        """Forget a trial request that ended without telling whether the host recovered."""
+        with self.lock:
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self.trial_running = False
+                self.trips += 1
+
+
+class HostCircuitBreakers:
+    """A CircuitBreaker for each host. A threshold of 0 or less disables them."""
+
+    def __init__(self, failure_threshold=DEFAULT_BREAKER_FAILURES, reset_timeout=DEFAULT_BREAKER_COOLDOWN):
+        self.lock = threading.Lock()
+        self.configure(failure_threshold, reset_timeout)
+
+    def configure(self, failure_threshold, reset_timeout):
+        """Set the failure threshold and cooldown, discarding existing breakers."""
+        with self.lock:
+            self.failure_threshold = failure_threshold
+            self.reset_timeout = reset_timeout
+            self.breakers = {}
+
+    def get(self, url):
+        """Return the breaker for the host of `url`, or None if breakers are disabled."""
+        if self.failure_threshold <= 0:
+            return None
+        host = urlparse(url).netloc
+        with self.lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def report(self):
+        with self.lock:
+            return {
+                host: {'trips': breaker.trips, 'rejected': breaker.rejected, 'open': breaker.opened_at is not None}
+                for host, breaker in sorted(self.breakers.items())
+            }
+
+
+# Global retry policy and per-host circuit breakers shared by all fetches
+RETRY_POLICY = RetryPolicy()
+CIRCUIT_BREAKERS = HostCircuitBreakers()
+
+
+class AimdLimiter:
+    """Limit on the requests in flight to one host, adapted by AIMD.
+
+    Each successful request whose latency stays within `latency_tolerance`
+    times the fastest recent one raises the limit by 1/limit, so about one
+    per round of requests (additive increase). A timeout, connection error,
+    429 or 5xx multiplies it by `decrease_factor` (multiplicative decrease),
+    at most once per round trip: failures of requests sent before the last
+    cut do not cut it again. The limit stays between 1 and `max_limit`.
+    """
+
+    def __init__(self, max_limit, decrease_factor=0.5, latency_tolerance=2.0, window=50):
+        self.max_limit = max(1, max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(self.max_limit)
+        self.lowest_limit = self.limit
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.last_decrease = 0.0
+        self.latencies = deque(maxlen=window)
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Block until another request may be sent. Returns a ticket for `release`."""
+        started = time.perf_counter()
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        ticket = time.perf_counter()
+        METRICS.record_sleep('concurrency_limit', ticket - started)
+        return ticket
+
+    def release(self, ticket, overloaded, latency=None):
+        """Finish the request `ticket` came from; `overloaded` if the host failed to serve it.
+
+        `latency` is how long the host took to answer, not counting waits on
+        this side such as the rate limiter; without it no sample is taken.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            if overloaded:
+                if ticket >= self.last_decrease:
+                    self.limit = max(1.0, self.limit * self.decrease_factor)
+                    self.lowest_limit = min(self.lowest_limit, self.limit)
+                    self.last_decrease = time.perf_counter()
+                    self.decreases += 1
+            elif latency is not None:
+                baseline = min(self.latencies, default=latency)
+                self.latencies.append(latency)
+                if latency <= baseline * self.latency_tolerance and self.limit < self.max_limit:
+                    self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                    self.increases += 1
+            self.condition.notify_all()
+
+
+class HostConcurrencyLimiter:
+    """An AimdLimiter for each host, allowing at most `max_limit` requests in flight.
+
+    When disabled, requests are limited only by the number of workers.
+    """
+
+    def __init__(self, max_limit=DEFAULT_FEED_CONCURRENCY, enabled=True):
+        self.lock = threading.Lock()
+        self.configure(max_limit, enabled)
+
+    def configure(self, max_limit, enabled):
+        """Set the largest limit and whether limiting is on, discarding existing limiters."""
+        with self.lock:
+            self.max_limit = max_limit
+            self.enabled = enabled
+            self.limiters = {}
+
+    def get(self, url):
+        """Return the limiter for the host of `url`, or None if limiting is off."""
+        if not self.enabled:
+            return None
+        host = urlparse(url).netloc
+        with self.lock:
+            limiter = self.limiters.get(host)
+            if limiter is None:
+                limiter = self.limiters[host] = AimdLimiter(self.max_limit)
+        return limiter
+
+    def report(self):
+        with self.lock:
+            return {
+                host: {
+                    'limit': int(limiter.limit),
+                    'lowest_limit': int(limiter.lowest_limit),
+                    'max_limit': limiter.max_limit,
+                    'peak_in_flight': limiter.peak_in_flight,
+                    'increases': limiter.increases,
+                    'decreases': limiter.decreases,
+                }
+                for host, limiter in sorted(self.limiters.items())
+            }
+
+
+# Global per-host adaptive concurrency limits shared by all fetches
+CONCURRENCY_LIMITER = HostConcurrencyLimiter()
+
+
+def abort_response(response):
+    """Close `response` from any thread, waking a read blocked on its body.
+
+    Closing a requests response alone leaves a pending read waiting for
+    data, so its socket is shut down first.
+    """
+    connection = getattr(getattr(response, 'raw', None), 'connection', None)
+    sock = getattr(connection, 'sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    response.close()
+
+
+def http_get(url, deadline=None, **kwargs):
+    """GET `url` with the thread's HTTP client once the host's rate limiter allows it.
+
+    With a `deadline` in seconds, the whole response must arrive within
+    that time of the request: waits for headers are cut short to fit, and
+    `iter_response_bytes` raises DeadlineExceeded once it has passed.
+    """
+    METRICS.record_sleep('rate_limit', RATE_LIMITER.acquire(url))
+    started = time.perf_counter()
+    timeout = REQUEST_TIMEOUT if not deadline else min(REQUEST_TIMEOUT, deadline)
+    try:
+        response = HTTP_CLIENTS.session().get(url, timeout=timeout, **kwargs)
+    except requests.RequestException as e:
+        METRICS.record_request(url, time.perf_counter() - started, error=e)
+        raise
+    response.latency = time.perf_counter() - started
+    METRICS.record_request(url, response.latency, status=response.status_code)
+    response.deadline = started + deadline if deadline else None
+    response.deadline_timer = None
+    if deadline:
+        # A read blocks until its whole chunk has arrived, so a body trickling
+        # in could outlast the deadline by far between two checks; closing the
+        # response once the deadline passes cuts the pending read short
+        response.deadline_timer = threading.Timer(max(0.0, response.deadline - time.perf_counter()),
+                                                  abort_response, (response,))
+        response.deadline_timer.daemon = True
+        response.deadline_timer.start()
+    if not kwargs.get('stream'):
+        METRICS.record_bytes(url, len(response.content))
+    return response
+
+
+def fetch_with_retries(url, handle, policy=None, budget=None, **kwargs):
+    """GET `url` with `http_get` and return `handle(response)`, retrying failures.
+
+    Connection errors, timeouts and RETRYABLE_STATUSES are retried
+    following `policy` (RETRY_POLICY by default); so are request errors
+    raised by `handle` while it reads the body. Other error statuses are
+    not retried. Every outcome feeds the host's circuit breaker, and no
+    request is made while it is open. Each attempt, `handle` included,
+    also holds a slot of the host's adaptive concurrency limit; a body
+    that `handle` leaves to be read later (such as a streamed feed) is
+    read outside the slot and outside the retries. With a `budget` (a
+    TimeBudget), every attempt's deadline is cut to the time left and no
+    attempt is started once it has run out. Raises FetchError
+    (CircuitOpenError for an open circuit) once the request has failed for
+    good.
+    """
+    policy = policy or RETRY_POLICY
+    breaker = CIRCUIT_BREAKERS.get(url)
+    limiter = CONCURRENCY_LIMITER.get(url)
+    deadline = kwargs.pop('deadline', None)
+    for attempt in range(policy.max_attempts):
+        if budget:
+            if budget.expired():
+                raise BudgetExhaustedError(url, "time budget used up")
+            kwargs['deadline'] = budget.clamp_deadline(deadline)
+        elif deadline:
+            kwargs['deadline'] = deadline
+        if breaker and not breaker.allow():
+            raise CircuitOpenError(url, "host is failing, circuit breaker open")
+        response = None
+        ticket = limiter.acquire() if limiter else None
+        try:
+            response = http_get(url, **kwargs)
+            if response.status_code in RETRYABLE_STATUSES:
+                response.close()
+                raise requests.HTTPError(f"{response.status_code} {response.reason}", response=response)
+            if response.status_code >= 400:
+                # The host answered, it just does not have what we asked for
+                response.close()
+                if breaker:
+                    breaker.record_success()
+                raise FetchError(url, f"HTTP {response.status_code} {response.reason}")
+            result = handle(response)
+        except requests.RequestException as e:
+            # Timeouts, connection errors, 429s and 5xx all mean the host is struggling
+            if limiter:
+                limiter.release(ticket, overloaded=True)
+            if breaker:
+                breaker.record_failure()
+            if attempt == policy.max_attempts - 1:
+                raise FetchError(url, f"failed after {policy.max_attempts} attempts: {e}") from e
+            delay = policy.delay(attempt, response)
+            if budget and budget.expired(after=delay):
+                # No time left to back off and try again
+                raise BudgetExhaustedError(url, f"time budget used up after {attempt + 1} attempts: {e}") from e
+            METRICS.record_retry(url)
+            METRICS.record_sleep('retry_backoff', delay)
+            print(f"    Error: {e}, retrying in {delay:.1f}s ({attempt + 1}/{policy.max_attempts - 1})...")
+            time.sleep(delay)
+            continue
+        except BaseException:
+            if limiter:
+                latency = response.latency if response is not None else None
+                limiter.release(ticket, overloaded=False, latency=latency)
+            if breaker:
+                if response is not None:
+                    # The host answered; what went wrong after that says nothing about its health
+                    breaker.record_success()
+                else:
+                    breaker.cancel_trial()
+            raise
+        if limiter:
+            limiter.release(ticket, overloaded=False, latency=response.latency)
+        if breaker:
+            breaker.record_success()
+        return result
+
+
+class RequestHedger:
+    """Issues a duplicate of a slow call and returns whichever copy finishes first.
+
+    The durations of completed calls are tracked over a sliding window.
+    Once `min_samples` are known, a call still running after the p95 of
+    the recent ones is hedged with a second copy, as long as hedges stay
+    below `max_fraction` of all calls. The slower copy runs to completion
+    and its result is discarded. A fraction of 0 or less disables hedging.
+    """
+
+    def __init__(self, max_fraction=0.0, workers=DEFAULT_DETAIL_WORKERS, window=200, min_samples=20):
+        self.window = window
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+        self.executor = None
+        self.configure(max_fraction, workers)
+
+    def configure(self, max_fraction, workers):
+        """Set the hedge budget and the number of callers, resetting the statistics."""
+        with self.lock:
+            if self.executor:
+                self.executor.shutdown(wait=False)
+            self.max_fraction = max_fraction
+            # Each caller runs at most its call and one hedge at a time
+            self.executor = ThreadPoolExecutor(max_workers=2 * max(1, workers)) if max_fraction > 0 else None
+            self.durations = deque(maxlen=self.window)
+            self.calls = 0
+            self.hedges = 0
+            self.hedge_wins = 0
+
+    def threshold(self):
+        """Return the seconds after which a call is hedged, or None while there are too few samples."""
+        with self.lock:
+            if len(self.durations) < self.min_samples:
+                return None
+            return percentile(sorted(self.durations), 0.95)
+
+    def _take_hedge(self):
+        with self.lock:
+            if self.hedges + 1 > self.max_fraction * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def _record(self, started):
+        with self.lock:
+            self.durations.append(time.perf_counter() - started)
+
+    def run(self, call):
+        """Return `call()`, hedging it with a second `call()` if it is slow."""
+        started = time.perf_counter()
+        with self.lock:
+            self.calls += 1
+            executor = self.executor
+        if executor is None:
+            result = call()
+            self._record(started)
+            return result
+        
+        primary = executor.submit(call)
+        done, _ = wait([primary], timeout=self.threshold())
+        if done or not self._take_hedge():
+            result = primary.result()
+            self._record(started)
+            return result
+        
+        hedge = executor.submit(call)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None or not pending:
+                    # First success wins; if both copies failed, raise the last error
+                    result = future.result()
+                    self._record(started)
+                    if future is hedge:
+                        with self.lock:
+                            self.hedge_wins += 1
+                    return result
+
+    def report(self):
+        threshold = self.threshold()
+        with self.lock:
+            return {
+                'max_fraction': self.max_fraction,
+                'calls': self.calls,
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins,
+                'threshold_seconds': threshold,
+            }
+
+
+# Global hedger for detail page fetches
+HEDGER = RequestHedger()
+
+
+def normalize_url(url):
+    """Return `url` with the scheme and host lowercased, default ports and the fragment dropped.
+
+    URLs that differ only in these ways name the same page.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rpartition(':')[2]) in (('http', '80'), ('https', '443')):
+        netloc = netloc.rpartition(':')[0]
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+class SingleFlight:
+    """Runs concurrent calls that share a key once, handing every caller the same result.
+
+    A call made while another with the same key is in flight waits for it
+    instead of repeating the work; its outcome, result or exception, is
+    shared. Once a call completes the key is forgotten, so later calls run
+    again (and can hit a cache instead).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key, call):
+        """Return `call()`, or the result of the in-flight call for `key`."""
+        with self.lock:
+            self.calls += 1
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.shared += 1
+                leader = False
+            else:
+                future = self.in_flight[key] = Future()
+                leader = True
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(call())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+        return future.result()
+
+    def report(self):
+        with self.lock:
+            return {'calls': self.calls, 'shared': self.shared}
+
+
+# Global single-flight group for detail page fetches
+DETAIL_FLIGHTS = SingleFlight()
+
+
+def iter_response_bytes(response, chunk_size):
+    """Iterate over the body of a streamed response, counting the bytes received.
+
+    Raises DeadlineExceeded if the response has a deadline (see `http_get`)
+    and it passes before the body is complete.
+    """
+    deadline = getattr(response, 'deadline', None)
+    timer = getattr(response, 'deadline_timer', None)
+    try:
+        for chunk in response.iter_content(chunk_size):
+            METRICS.record_bytes(response.url, len(chunk))
+            if deadline and time.perf_counter() > deadline:
+                response.close()
+                raise DeadlineExceeded("response did not complete before its deadline", response=response)
+            yield chunk
+    except Exception as e:
+        # The deadline timer closed the response under a pending read
+        if deadline and time.perf_counter() > deadline and not isinstance(e, DeadlineExceeded):
+            raise DeadlineExceeded("response did not complete before its deadline", response=response) from e
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+
+
+def parse_date_input(date_str):
+    """Parse date input in m/d/yy format."""
+    try:
+        # Parse as naive datetime, then convert to match timezone-aware datetimes
+        dt = datetime.strptime(date_str.strip(), "%m/%d/%y")
+        # Set to UTC for comparison
+        return dt.replace(tzinfo=timezone.utc)
+    except ValueError:
+        print(f"Invalid date format: {date_str}. Please use m/d/yy format.")
+        sys.exit(1)
+
+
+def parse_iso_datetime(iso_string):
+    """Parse ISO 8601 datetime string; None if it is empty or invalid."""
+    if not iso_string:
+        return None
+    # Handle both with and without timezone
+    if iso_string.endswith('Z'):
+        iso_string = iso_string[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(iso_string)
+    except ValueError:
+        return None
+
+
+class FeedCache:
+    """On-disk cache of feed bodies and their HTTP validators.
+
+    Each feed URL gets a `<key>.json` file with its ETag / Last-Modified
+    values and a `<key>.xml` file with the body last returned for it.
+    In `offline` mode the stored bodies are used without any request.
+    """
+
+    def __init__(self, directory, offline=False):
+        self.offline = offline
+        self.directory = os.path.join(directory, 'feeds')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        base = os.path.join(self.directory, key)
+        return base + '.json', base + '.xml'
+
+    def conditional_headers(self, url):
+        """Return If-None-Match / If-Modified-Since headers for `url`, or {} if nothing is cached."""
+        meta_path, body_path = self._paths(url)
+        if not os.path.exists(body_path):
+            return {}
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load_body(self, url):
+        """Return the cached body bytes for `url`, or None if there is none."""
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store_stream(self, url, response, chunks):
+        """Pass `chunks` through unchanged while saving them as the body for `url`.
+
+        The body and the validators from `response` are committed only once
+        `chunks` has been fully consumed, so an interrupted download never
+        replaces a good cached copy. Responses without an ETag or
+        Last-Modified header are not cached.
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            yield from chunks
+            return
+        meta_path, body_path = self._paths(url)
+        tmp_path = body_path + f'.{threading.get_ident()}.tmp'
+        complete = False
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            complete = True
+        finally:
+            if not complete:
+                os.remove(tmp_path)
+        os.replace(tmp_path, body_path)
+        meta = {'url': url, 'etag': etag, 'last_modified': last_modified}
+        with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + '.tmp', meta_path)
+
+
+def fetch_rss_feed(url, cache=None, policy=None, buffered=False):
+    """Fetch RSS feed from URL with retries.
+
+    Returns an iterator over the raw body bytes, read from the network as
+    it is consumed so parsing can overlap the download. With a `cache`, the
+    request is made conditional on the stored validators and a 304 Not
+    Modified response returns the stored body. Raises FetchError if the
+    feed cannot be fetched; a connection lost part way through the body
+    surfaces as a requests exception while the iterator is consumed,
+    unless the body is `buffered`: then it is read in full before
+    returning, so such failures are retried like any other.
+    """
+    if cache and cache.offline:
+        body = cache.load_body(url)
+        if body is None:
+            raise FetchError(url, "no cached copy available offline")
+        return iter([body])
+    
+    def open_body(response):
+        if response.status_code == 304 and cache:
+            response.close()
+            body = cache.load_body(url)
+            if body is not None:
+                return iter([body])
+        chunks = iter_response_bytes(response, FEED_CHUNK_SIZE)
+        if cache:
+            chunks = cache.store_stream(url, response, chunks)
+        if buffered:
+            return iter([b''.join(chunks)])
+        return chunks
+    
+    headers = cache.conditional_headers(url) if cache else {}
+    return fetch_with_retries(url, open_body, policy=policy, headers=headers, stream=True)
+
+
+class DetailCache:
+    """SQLite cache of the fields extracted from event detail pages, keyed by event GUID.
+
+    Entries younger than `ttl` seconds are used without touching the
+    network. Older entries are revalidated with a conditional request and
+    kept on 304 Not Modified. Once the cache holds more than `max_entries`
+    rows the least recently used ones are evicted. In `offline` mode only
+    cached entries are returned and no requests are made.
+    """
+
+    def __init__(self, directory, ttl=DEFAULT_DETAIL_CACHE_TTL, max_entries=DEFAULT_DETAIL_CACHE_SIZE, offline=False):
+        os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.offline = offline
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, 'details.sqlite3'), check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS detail_pages ('
+                'guid TEXT PRIMARY KEY, url TEXT, speaker TEXT, location TEXT, youtube_link TEXT, '
+                'etag TEXT, last_modified TEXT, fetched_at REAL, accessed_at REAL)'
+            )
+
+    def get(self, guid):
+        """Return the cached entry for `guid` as a dict, or None."""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT speaker, location, youtube_link, etag, last_modified, fetched_at '
+                'FROM detail_pages WHERE guid = ?', (guid,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute('UPDATE detail_pages SET accessed_at = ? WHERE guid = ?', (time.time(), guid))
+        speaker, location, youtube_link, etag, last_modified, fetched_at = row
+        return {
+            'fields': (speaker, location, youtube_link),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': fetched_at,
+        }
+
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def put(self, guid, url, fields, response):
+        """Store the extracted `fields` for `guid` along with the validators from `response`."""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO detail_pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (guid, url, *fields, response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now)
+            )
+            # Evict least recently used entries beyond the size bound
+            self.conn.execute(
+                'DELETE FROM detail_pages WHERE guid IN '
+                '(SELECT guid FROM detail_pages ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def mark_revalidated(self, guid):
+        """Restart the TTL of `guid` after the server confirmed it is unchanged."""
+        with self.lock, self.conn:
+            self.conn.execute('UPDATE detail_pages SET fetched_at = ? WHERE guid = ?', (time.time(), guid))
+
+    def count(self, outcome):
+        """Count a lookup outcome ('hits', 'revalidated' or 'misses') for the run summary."""
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class EventStore:
+    """Persistent SQLite store of every event seen, keyed by GUID.
+
+    Each row keeps the parsed event, a hash of its raw feed item and the
+    enriched fields (speaker, detail location, YouTube link) along with the
+    item hash they were computed for. An event whose feed item has not
+    changed since it was enriched reuses those fields instead of being
+    enriched again, so repeated runs only do network work for new or
+    changed events.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(directory, 'events.sqlite3'), check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS events ('
+                'guid TEXT PRIMARY KEY, content_hash TEXT, data TEXT, '
+                'speaker TEXT, detail_location TEXT, youtube_link TEXT, enriched_hash TEXT, '
+                'first_seen REAL, last_seen REAL)'
+            )
+
+    def reuse(self, event, count=True):
+        """Copy stored enriched fields onto `event` if its feed item is unchanged.
+
+        Returns True if the event needs no further enrichment. With `count`,
+        the outcome is added to `stats` for the run summary.
+        """
+        if not event.guid:
+            return False
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT content_hash, speaker, detail_location, youtube_link, enriched_hash '
+                'FROM events WHERE guid = ?', (event.guid,)
+            ).fetchone()
+            if row is None:
+                if count:
+                    self.stats['new'] += 1
+                return False
+            content_hash, speaker, detail_location, youtube_link, enriched_hash = row
+            if enriched_hash != event.content_hash:
+                if count:
+                    self.stats['changed' if content_hash != event.content_hash else 'unenriched'] += 1
+                return False
+            if count:
+                self.stats['unchanged'] += 1
+        event.speaker = speaker
+        event.detail_location = detail_location
+        event.youtube_link = youtube_link
+        return True
+
+    def save(self, events, enriched_events):
+        """Upsert all `events` and record the fields of `enriched_events`.
+
+        Enriched events for which nothing was found (for example because
+        every fetch failed) are not recorded, so they are retried next run.
+        """
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                'INSERT INTO events (guid, content_hash, data, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(guid) DO UPDATE SET content_hash = excluded.content_hash, '
+                'data = excluded.data, last_seen = excluded.last_seen',
+                [(event.guid, event.content_hash, json.dumps(event.to_dict()), now, now)
+                 for event in events if event.guid]
+            )
+            self.conn.executemany(
+                'UPDATE events SET speaker = ?, detail_location = ?, youtube_link = ?, enriched_hash = ? '
+                'WHERE guid = ?',
+                [(event.speaker, event.detail_location, event.youtube_link, event.content_hash, event.guid)
+                 for event in enriched_events
+                 if event.guid and (event.speaker or event.detail_location or event.youtube_link)]
+            )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+YOUTUBE_LINK_RE = re.compile(r'https://(?:www\.)?youtu\.be/[^\s<"]*')
+
+# Only these blocks of a detail page are needed for extraction
+DETAIL_PAGE_BLOCKS = ['pageTitle', 'event-detail-float', 'event-detail-wrap']
+# Once these blocks have closed the rest of a detail page can be skipped
+DETAIL_PAGE_END_BLOCKS = ['pageTitle', 'event-detail-float', 'description-wrap']
+
+
+def _detail_fields_from_soup(soup):
+    speaker = None
+    location = None
+    youtube_link = None
+    
+    # Extract speaker name from .pageTitle > .subtitle
+    page_title = soup.find('div', class_='pageTitle')
+    if page_title:
+        subtitle = page_title.find('div', class_='subtitle')
+        if subtitle:
+            speaker = subtitle.get_text(strip=True)
+    
+    # Extract location from .event-detail-float .place
+    event_detail_float = soup.find('div', class_='event-detail-float')
+    if event_detail_float:
+        place = event_detail_float.find('div', class_='place')
+        if place:
+            location = place.get_text(strip=True)
+    
+    # Extract YouTube link from description
+    event_detail_wrap = soup.find('div', class_='event-detail-wrap')
+    if event_detail_wrap:
+        description_wrap = event_detail_wrap.find('div', class_='description-wrap')
+        if description_wrap:
+            # Look for YouTube link
+            youtube_match = YOUTUBE_LINK_RE.search(description_wrap.get_text())
+            if youtube_match:
+                youtube_link = youtube_match.group(0)
+    
+    return speaker, location, youtube_link
+
+
+def extract_detail_fields_soup(html):
+    """Extract detail fields from a full BeautifulSoup parse of the page."""
+    return _detail_fields_from_soup(BeautifulSoup(html, 'html.parser'))
+
+
+def _is_detail_block_class(value):
+    """SoupStrainer class filter: True if any class in `value` is one of DETAIL_PAGE_BLOCKS."""
+    return bool(value) and any(name in DETAIL_PAGE_BLOCKS for name in value.split())
+
+
+def extract_detail_fields_strainer(html):
+    """Extract detail fields, building soup only for the blocks that hold them."""
+    strainer = SoupStrainer('div', class_=_is_detail_block_class)
+    return _detail_fields_from_soup(BeautifulSoup(html, 'html.parser', parse_only=strainer))
+
+
+def _lxml_class_xpath(name):
+    return f"div[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+
+
+def extract_detail_fields_lxml(html):
+    """Extract detail fields with lxml and XPath."""
+    root = lxml.html.fromstring(html)
+    
+    def first(path):
+        found = root.xpath(path)
+        return found[0] if found else None
+    
+    def stripped_text(element):
+        # Same result as BeautifulSoup's get_text(strip=True)
+        return ''.join(piece.strip() for piece in element.xpath('.//text()'))
+    
+    speaker = None
+    location = None
+    youtube_link = None
+    
+    subtitle = first(f"(//{_lxml_class_xpath('pageTitle')})[1]//{_lxml_class_xpath('subtitle')}")
+    if subtitle is not None:
+        speaker = stripped_text(subtitle)
+    
+    place = first(f"(//{_lxml_class_xpath('event-detail-float')})[1]//{_lxml_class_xpath('place')}")
+    if place is not None:
+        location = stripped_text(place)
+    
+    description_wrap = first(f"(//{_lxml_class_xpath('event-detail-wrap')})[1]//{_lxml_class_xpath('description-wrap')}")
+    if description_wrap is not None:
+        youtube_match = YOUTUBE_LINK_RE.search(''.join(description_wrap.xpath('.//text()')))
+        if youtube_match:
+            youtube_link = youtube_match.group(0)
+    
+    return speaker, location, youtube_link
+
+
+def extract_detail_fields_selectolax(html):
+    """Extract detail fields with selectolax CSS selectors."""
+    tree = SelectolaxHTMLParser(html)
+    
+    speaker = None
+    location = None
+    youtube_link = None
+    
+    page_title = tree.css_first('div.pageTitle')
+    subtitle = page_title.css_first('div.subtitle') if page_title else None
+    if subtitle:
+        speaker = subtitle.text(strip=True)
+    
+    event_detail_float = tree.css_first('div.event-detail-float')
+    place = event_detail_float.css_first('div.place') if event_detail_float else None
+    if place:
+        location = place.text(strip=True)
+    
+    event_detail_wrap = tree.css_first('div.event-detail-wrap')
+    description_wrap = event_detail_wrap.css_first('div.description-wrap') if event_detail_wrap else None
+    if description_wrap:
+        youtube_match = YOUTUBE_LINK_RE.search(description_wrap.text())
+        if youtube_match:
+            youtube_link = youtube_match.group(0)
+    
+    return speaker, location, youtube_link
+
+
+# Detail page extraction backends, fastest first. lxml and selectolax are
+# optional dependencies and are only offered when installed.
+DETAIL_EXTRACTORS = {}
+if SelectolaxHTMLParser is not None:
+    DETAIL_EXTRACTORS['selectolax'] = extract_detail_fields_selectolax
+if lxml is not None:
+    DETAIL_EXTRACTORS['lxml'] = extract_detail_fields_lxml
+DETAIL_EXTRACTORS['strainer'] = extract_detail_fields_strainer
+DETAIL_EXTRACTORS['soup'] = extract_detail_fields_soup
+
+DETAIL_EXTRACTOR_CHOICES = ['auto', 'selectolax', 'lxml', 'strainer', 'soup']
+
+
+def resolve_detail_extractor(name):
+    """Return the name of the backend to use for `name`.
+
+    'auto' picks the fastest installed backend that parses the whole page
+    (selectolax, then lxml) and otherwise the BeautifulSoup path. A backend
+    that is not installed falls back to 'soup'.
+    """
+    if name == 'auto':
+        for candidate in ('selectolax', 'lxml'):
+            if candidate in DETAIL_EXTRACTORS:
+                return candidate
+        return 'soup'
+    if name not in DETAIL_EXTRACTORS:
+        print(f"Extractor '{name}' is not installed, using 'soup'")
+        return 'soup'
+    return name
+
+
+def extract_detail_fields(html, extractor='soup'):
+    """Extract (speaker, location, youtube_link) from an event detail page.
+
+    Falls back to the full BeautifulSoup parse if the chosen backend fails.
+    """
+    if extractor != 'soup':
+        try:
+            return DETAIL_EXTRACTORS[extractor](html)
+        except Exception:
+            pass
+    return extract_detail_fields_soup(html)
+
+
+class DetailBlockTracker(HTMLParser):
+    """Incremental HTML scanner that reports when the detail page blocks
+    holding the fields we extract have been closed."""
+
+    def __init__(self, blocks=DETAIL_PAGE_END_BLOCKS):
+        super().__init__(convert_charrefs=False)
+        self.pending = set(blocks)
+        self.open_blocks = []
+        self.depth = 0
+
+    @property
+    def done(self):
+        return not self.pending
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'div':
+            return
+        self.depth += 1
+        classes = (dict(attrs).get('class') or '').split()
+        for block in self.pending:
+            if block in classes:
+                self.open_blocks.append((block, self.depth))
+
+    def handle_endtag(self, tag):
+        if tag != 'div':
+            return
+        while self.open_blocks and self.open_blocks[-1][1] == self.depth:
+            block, _ = self.open_blocks.pop()
+            self.pending.discard(block)
+        self.depth -= 1
+
+
+def drain_response(chunks, limit=DETAIL_DRAIN_BYTES):
+    """Read what is left of a response body, up to `limit` bytes.
+
+    A response read to the end hands its connection back to the pool,
+    while one closed mid-body takes the connection down with it. Errors
+    are ignored, the caller already has what it needs from the body.
+    """
+    drained = 0
+    try:
+        for chunk in chunks:
+            drained += len(chunk)
+            if drained > limit:
+                return
+    except requests.RequestException:
+        pass
+
+
+def read_detail_page(response, max_bytes=DEFAULT_MAX_DETAIL_BYTES, early_abort=True):
+    """Read the body of a streamed detail page response and return it as text.
+
+    With `early_abort`, reading stops as soon as the blocks in
+    DETAIL_PAGE_END_BLOCKS have closed, skipping the footer and scripts.
+    Reading always stops after `max_bytes`; the truncated page is still
+    parsed, since the extractors tolerate unclosed tags.
+    """
+    body = bytearray()
+    tracker = None
+    decoder = None
+    scanned = 0
+    markers = [block.encode('ascii') for block in DETAIL_PAGE_END_BLOCKS]
+    chunks = iter_response_bytes(response, DETAIL_CHUNK_SIZE)
+    try:
+        for chunk in chunks:
+            body.extend(chunk)
+            if len(body) >= max_bytes:
+                print(f"    Detail page exceeded {max_bytes} bytes, truncating...")
+                del body[max_bytes:]
+                break
+            if not early_abort:
+                continue
+            if tracker is None:
+                # Only start the (slow, pure-Python) scanner at the first
+                # block we care about, skipping the navigation header
+                found = [i for i in (body.find(marker, max(0, scanned - 32)) for marker in markers) if i >= 0]
+                scanned = len(body)
+                if not found:
+                    continue
+                start = max(0, body.rfind(b'<div', 0, min(found)))
+                tracker = DetailBlockTracker()
+                decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+                tracker.feed(decoder.decode(bytes(body[start:])))
+            else:
+                tracker.feed(decoder.decode(chunk))
+            if tracker.done:
+                drain_response(chunks)
+                break
+    finally:
+        # Cancels the deadline timer even if the body was not read to the end
+        chunks.close()
+        response.close()
+    return bytes(body).decode(response.encoding or 'utf-8', errors='replace')
+
+
+def fetch_event_detail_page(url, guid=None, **options):
+    """Fetch event detail page and extract speaker and location info with retries.
+
+    Concurrent calls for the same page (same normalized URL and GUID)
+    share one request and one parse through DETAIL_FLIGHTS. See
+    `_fetch_event_detail_page` for the `options`.
+    """
+    return DETAIL_FLIGHTS.do((normalize_url(url), guid),
+                             partial(_fetch_event_detail_page, url, guid=guid, **options))
+
+
+def _fetch_event_detail_page(url, cache=None, guid=None, extractor='soup',
+                             max_bytes=DEFAULT_MAX_DETAIL_BYTES, early_abort=True, policy=None,
+                             deadline=DEFAULT_REQUEST_DEADLINE, budget=None):
+    """Fetch event detail page and extract speaker and location info with retries.
+
+    With a `cache` and the event's `guid`, fresh cached fields are returned
+    without a request and stale ones are revalidated conditionally. If
+    every attempt fails, stale cached fields are still better than none.
+    The page is streamed and read only as far as `read_detail_page` needs,
+    each attempt within `deadline` seconds. Slow fetches may be hedged by
+    HEDGER.
+    """
+    try:
+        entry = cache.get(guid) if cache and guid else None
+    except sqlite3.Error as e:
+        # e.g. locked by an overlapping run; fetch the page as if it were not cached
+        print(f"    Detail cache unavailable ({e}), fetching without it...")
+        cache, entry = None, None
+    if entry and (cache.offline or cache.is_fresh(entry)):
+        cache.count('hits')
+        return entry['fields']
+    if cache and cache.offline:
+        cache.count('misses')
+        return None, None, None
+    
+    headers = {}
+    if entry:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+    fallback = entry['fields'] if entry else (None, None, None)
+    
+    def read_page(response):
+        if response.status_code == 304 and entry:
+            response.close()
+            return response, None
+        return response, read_detail_page(response, max_bytes=max_bytes, early_abort=early_abort)
+    
+    try:
+        # Politeness is handled by the per-host rate limiter in http_get
+        response, html = HEDGER.run(partial(fetch_with_retries, url, read_page, policy=policy, budget=budget,
+                                            headers=headers, stream=True, deadline=deadline))
+        if html is None:
+            cache.mark_revalidated(guid)
+            cache.count('revalidated')
+            return entry['fields']
+        with METRICS.span('extract_detail_fields'):
+            fields = extract_detail_fields(html, extractor)
+        if cache and guid:
+            cache.count('misses')
+            cache.put(guid, url, fields, response)
+        return fields
+    except BudgetExhaustedError:
+        # Counted in the time budget summary
+        return fallback
+    except FetchError as e:
+        print(f"    {e}, skipping...")
+        return fallback
+    except Exception as e:
+        # Silently skip parsing errors
+        return fallback
+
+
+class Event:
+    """An event from a group feed, normalized once when the feed is parsed.
+
+    The raw feed fields keep their feed names. Values derived from them
+    (parsed start/end datetimes, the display title, the cleaned
+    description with its Zoom URL and in-person location) are computed
+    here once, so filtering, sorting and rendering never re-parse them.
+    """
+
+    FIELDS = ('title', 'link', 'guid', 'feed_guid', 'content_hash', 'description', 'category', 'pubDate',
+              'startdate', 'enddate', 'location', 'organizer', 'event_type',
+              'speaker', 'detail_location', 'youtube_link')
+    __slots__ = FIELDS + ('start', 'end', 'display_title', 'clean_description', 'zoom_url',
+                          'description_location')
+
+    def __init__(self, title='Untitled', link='', guid='', feed_guid='', content_hash='', description='', category='',
+                 pubDate='', startdate='', enddate='', location='', organizer='', event_type='',
+                 speaker=None, detail_location=None, youtube_link=None):
+        self.title = title
+        self.link = link
+        self.guid = guid
+        # The GUID exactly as the feed sent it; `guid` is its numeric part
+        self.feed_guid = feed_guid
+        self.content_hash = content_hash
+        self.description = description
+        self.category = category
+        self.pubDate = pubDate
+        self.startdate = startdate
+        self.enddate = enddate
+        self.location = location
+        self.organizer = organizer
+        self.event_type = event_type
+        # Populated from the detail page, the feed description or the event store
+        self.speaker = speaker
+        self.detail_location = detail_location
+        self.youtube_link = youtube_link
+        
+        self.start = parse_iso_datetime(startdate)
+        self.end = parse_iso_datetime(enddate)
+        self.display_title = titlecase(clean_event_title(title))
+        self.clean_description = clean_html_description(description)
+        zoom_match = ZOOM_URL_RE.search(self.clean_description)
+        self.zoom_url = zoom_match.group(0) if zoom_match else None
+        self.description_location = location_from_clean_description(self.clean_description)
+
+    @property
+    def display_location(self):
+        """Detail page location, else the in-person location from the description, else the feed location."""
+        return self.detail_location or self.description_location or self.location
+
+    def to_dict(self):
+        """Return the raw and enriched fields as a plain dict."""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+# Namespaces used by the event fields in group feeds
+RSS_NAMESPACES = {
+    'ev': 'http://purl.org/rss/1.0/modules/event/',
+    'media': 'http://search.yahoo.com/mrss/'
+}
+
+
+def element_text(element, default=''):
+    """Return the text of an optional element; `default` if it is missing or empty."""
+    if element is None or element.text is None:
+        return default
+    return element.text
+
+
+def item_content_hash(item):
+    """Return the SHA-1 of an RSS `<item>` element, leaving out its tail.
+
+    Whether the whitespace after `</item>` has been parsed into the tail
+    depends on where the download was split into chunks, so it must not
+    change the hash.
+    """
+    tail, item.tail = item.tail, None
+    try:
+        return hashlib.sha1(ET.tostring(item)).hexdigest()
+    finally:
+        item.tail = tail
+
+
+def rss_item_to_event(item):
+    """Build an Event from an RSS `<item>` element."""
+    namespaces = RSS_NAMESPACES
+    
+    title = item.find('title')
+    link = item.find('link')
+    guid = item.find('guid')
+    description = item.find('description')
+    category = item.find('category')
+    pubDate = item.find('pubDate')
+    
+    # Get event-specific fields
+    startdate = item.find('ev:startdate', namespaces)
+    enddate = item.find('ev:enddate', namespaces)
+    location = item.find('ev:location', namespaces)
+    organizer = item.find('ev:organizer', namespaces)
+    event_type = item.find('ev:type', namespaces)
+    
+    # Extract GUID for URL generation
+    guid_text = element_text(guid)
+    guid_number = guid_text.split('@')[0] if '@' in guid_text else ''
+    
+    # Generate proper event URL from GUID
+    event_url = EVENT_URL_TEMPLATE.format(base=LSA_BASE_URL, guid=guid_number) if guid_number else ''
+    
+    return Event(
+        title=element_text(title, 'Untitled'),
+        link=event_url,
+        guid=guid_number,
+        feed_guid=guid_text.strip(),
+        content_hash=item_content_hash(item),
+        description=element_text(description),
+        category=element_text(category),
+        pubDate=element_text(pubDate),
+        startdate=element_text(startdate),
+        enddate=element_text(enddate),
+        location=element_text(location),
+        organizer=element_text(organizer),
+        event_type=element_text(event_type),
+    )
+
+
+def iter_rss_items(chunks):
+    """Incrementally parse RSS content and yield an Event as each `<item>` closes.
+
+    `chunks` is an iterable of str or bytes pieces of the document. Items
+    are detached from the tree once converted, so memory stays flat however
+    large the feed is. Raises ET.ParseError on malformed XML.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    open_elements = []
+    
+    def drain():
+        for kind, elem in parser.read_events():
+            if kind == 'start':
+                open_elements.append(elem)
+                continue
+            open_elements.pop()
+            if elem.tag == 'item':
+                yield rss_item_to_event(elem)
+                if open_elements:
+                    open_elements[-1].remove(elem)
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def parse_rss_feed(rss_content):
+    """Parse RSS feed XML content.
+
+    `rss_content` may be a complete document (str or bytes) or an iterable
+    of byte chunks such as the one returned by `fetch_rss_feed`.
+    """
+    if isinstance(rss_content, (str, bytes)):
+        rss_content = [rss_content]
+    try:
+        return list(iter_rss_items(rss_content))
+    except ET.ParseError as e:
+        raise FeedParseError(f"Error parsing RSS feed: {e}") from e
+
+
+def iter_feed_events(url, cache=None, policy=None):
+    """Fetch the feed at `url` and yield its events as they are parsed.
+
+    The body is streamed, see `fetch_rss_feed`. If the connection is lost
+    part way through, the host's circuit breaker is told and the feed is
+    fetched again with its body buffered, so that further failures are
+    retried by `fetch_with_retries` within the attempts `policy` has left;
+    the events already yielded are skipped. Raises ET.ParseError on malformed XML and FetchError if the
+    feed cannot be fetched.
+    """
+    policy = policy or RETRY_POLICY
+    yielded = 0
+    try:
+        for event in iter_rss_items(fetch_rss_feed(url, cache=cache, policy=policy)):
+            yield event
+            yielded += 1
+        return
+    except requests.RequestException as e:
+        breaker = CIRCUIT_BREAKERS.get(url)
+        if breaker:
+            breaker.record_failure()
+        if policy.max_attempts <= 1:
+            raise FetchError(url, f"failed after 1 attempt: {e}") from e
+        delay = policy.delay(0)
+        METRICS.record_retry(url)
+        METRICS.record_sleep('retry_backoff', delay)
+        print(f"    Error reading feed: {e}, fetching it again in {delay:.1f}s...")
+        time.sleep(delay)
+    remaining = RetryPolicy(policy.max_attempts - 1, policy.base_delay, policy.max_delay)
+    body = fetch_rss_feed(url, cache=cache, policy=remaining, buffered=True)
+    yield from itertools.islice(iter_rss_items(body), yielded, None)
+
+
+def fetch_feed_events(feed_id, cache=None):
+    """Fetch and parse a single group feed.
+
+    Returns the list of parsed events, or None if the feed could not be
+    fetched or parsed.
+    """
+    url = FEED_URL_TEMPLATE.format(base=EVENTS_BASE_URL, feed_id=feed_id)
+    try:
+        return list(iter_feed_events(url, cache=cache))
+    except ET.ParseError as e:
+        print(f"  Feed ID {feed_id}: Error parsing RSS feed: {e}")
+        return None
+    except ScraperError as e:
+        print(f"  Feed ID {feed_id}: {e}")
+        return None
+    except requests.RequestException as e:
+        # The connection failed part way through the body
+        print(f"  Error reading feed ID {feed_id}: {e}")
+        return None
+
+
+def fetch_all_feeds(feed_ids, concurrency=DEFAULT_FEED_CONCURRENCY, cache=None):
+    """Fetch and parse all group feeds, up to `concurrency` at a time.
+
+    Returns a list of (feed_id, events) pairs in the same order as
+    `feed_ids`, whatever order the fetches complete in, so deduplication
+    downstream keeps the same first occurrence as a sequential run.
+    `events` is None for feeds that failed.
+    """
+    results = []
+    if concurrency <= 1:
+        for feed_id in feed_ids:
+            print(f"Fetching feed ID {feed_id}...")
+            results.append((feed_id, fetch_feed_events(feed_id, cache=cache)))
+            # Add delay between feed fetches
+            random_delay(0.5, 1.5)
+        return results
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for feed_id, events in zip(feed_ids, executor.map(partial(fetch_feed_events, cache=cache), feed_ids)):
+            results.append((feed_id, events))
+    return results
+
+
+class TimeBudget:
+    """Wall-clock time allowed for a whole run, counted from its creation.
+
+    A budget of None is unlimited.
+    """
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.started = time.perf_counter()
+        self.unenriched = 0
+
+    def record_unenriched(self, count):
+        """Count events whose detail page was not fetched for lack of time."""
+        self.unenriched += count
+
+    def remaining(self):
+        """Return the seconds left, or None for an unlimited budget."""
+        if self.seconds is None:
+            return None
+        return max(0.0, self.started + self.seconds - time.perf_counter())
+
+    def expired(self, after=0.0):
+        """Return True if the budget has run out, or will have `after` seconds from now."""
+        return self.seconds is not None and self.remaining() <= after
+
+    def clamp_deadline(self, deadline):
+        """Return the request `deadline` (seconds, 0 or None for none) cut to the time left."""
+        remaining = self.remaining()
+        if remaining is None:
+            return deadline
+        deadline = min(deadline, remaining) if deadline else remaining
+        # A deadline of 0 would disable it
+        return max(deadline, 0.001)
+
+    def fetch_options(self, fetch_options):
+        """Return `fetch_options` with the request deadline cut to the time left.
+
+        The budget itself is passed along too, so retries stop once it runs out.
+        """
+        if self.seconds is None:
+            return fetch_options
+        deadline = self.clamp_deadline(fetch_options.get('deadline', DEFAULT_REQUEST_DEADLINE))
+        return dict(fetch_options, deadline=deadline, budget=self)
+
+
+def enrichment_priority(event, now):
+    """Sort key putting the events that start nearest to `now` first."""
+    return abs((event.start - now).total_seconds())
+
+
+def plan_enrichment(events):
+    """Fill in what each feed item already provides and return the events
+    that still need their detail page fetched.
+
+    Feeds are requested with html_output=true, so the description often
+    carries the speaker as "Name (Affiliation)", an "In-person:" location
+    and any youtu.be livestream link. Only events where the speaker or the
+    location cannot be recovered from the feed are returned.
+    """
+    return [event for event in events if event.link and not apply_feed_fields(event)]
+
+
+def report_enrichment_plan(linked, needed):
+    """Print and record in METRICS how many of `linked` detail requests the planner saved."""
+    METRICS.set_section('enrichment_plan', {'linked': linked, 'skipped': linked - needed})
+    print(f"Skipping {linked - needed} of {linked} detail requests "
+          f"(speaker and location already in the feed)")
+
+
+def apply_feed_fields(event):
+    """Fill in speaker and YouTube link from the feed description of `event`.
+
+    Returns True if the feed item provides both speaker and location, so
+    the detail page is not needed. The event is left untouched otherwise.
+    """
+    speaker = speaker_from_clean_description(event.clean_description, require_affiliation=True)
+    location = event.description_location or event.location
+    if not speaker or not location:
+        return False
+    event.speaker = speaker
+    youtube_match = YOUTUBE_LINK_RE.search(event.description)
+    if youtube_match:
+        event.youtube_link = youtube_match.group(0)
+    return True
+
+
+def enrich_events(events, workers=DEFAULT_DETAIL_WORKERS, budget=None, **fetch_options):
+    """Fetch detail pages for `events` in parallel and fill in their
+    speaker, detail location and YouTube link.
+
+    Events are fetched nearest start first. Once the `budget` (a
+    TimeBudget) runs out, the remaining fetches are abandoned and those
+    events render with what their feed item provides. `fetch_options` are
+    passed on to `fetch_event_detail_page`.
+    """
+    budget = budget or TimeBudget()
+    now = datetime.now(timezone.utc)
+    targets = sorted((event for event in events if event.link), key=partial(enrichment_priority, now=now))
+    if not targets:
+        return
+
+    def fetch(event):
+        return fetch_event_detail_page(event.link, guid=event.guid, **budget.fetch_options(fetch_options))
+
+    done = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {executor.submit(fetch, event): event for event in targets}
+        for future in as_completed(futures, timeout=budget.remaining()):
+            done += 1
+            event = futures[future]
+            event.speaker, event.detail_location, event.youtube_link = future.result()
+            print(f"  Fetched details for event {done}/{len(targets)}: {event.title[:50]}...")
+    except FutureTimeoutError:
+        budget.record_unenriched(len(targets) - done)
+        print(f"  Time budget used up, {len(targets) - done} events keep the details from their feed item")
+    finally:
+        # Fetches still in flight stop retrying once the budget has run out and
+        # their attempts end by then, so waiting for them is short; their
+        # results are dropped
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def dedupe_by_link(events):
+    """Drop events whose `link` was already seen, keeping the first occurrence.
+
+    Events without a link are never considered duplicates.
+    """
+    deduped_events = []
+    seen_links = set()
+    for ev in events:
+        link = ev.link
+        if link:
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+        deduped_events.append(ev)
+    return deduped_events
 
-# Configure session with browser-like headers
-def create_session():
-    """Create a requests session with browser-like headers."""
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'DNT': '1',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-        'Sec-Fetch-Dest': 'document',
-        'Sec-Fetch-Mode': 'navigate',
-        'Sec-Fetch-Site': 'none',
-        'Sec-Fetch-User': '?1',
-        'Cache-Control': 'max-age=0',
-    })
-    return session
 
+class EventIndex:
+    """Events sorted by start time, for O(log n + k) date range queries.
 
-# Global session object
-SESSION = create_session()
+    Built once per run from the deduplicated events: events without a start
+    time and repeats of a GUID are dropped, the rest are ordered by start
+    time (keeping feed order among equal starts). Every EventRangeView is a
+    slice of the same index, so the range selection in main() and the
+    output writers share one sorted list.
+    """
 
+    def __init__(self, events):
+        self.events = []
+        seen_guids = set()
+        for event in events:
+            if event.start is None:
+                continue
+            # Skip duplicate events (same GUID)
+            guid = event.guid
+            if guid and guid in seen_guids:
+                continue
+            if guid:
+                seen_guids.add(guid)
+            self.events.append(event)
+        # Sort by start date and time
+        self.events.sort(key=lambda e: e.start)
+        self.starts = [event.start for event in self.events]
 
-def random_delay(min_seconds=0.5, max_seconds=2.0):
-    """Add a random delay to appear more human-like."""
-    time.sleep(random.uniform(min_seconds, max_seconds))
+    def __len__(self):
+        return len(self.events)
 
+    def between(self, start_date, end_date):
+        """Return the events starting between `start_date` and `end_date`, in start order."""
+        first = bisect_left(self.starts, start_date)
+        last = bisect_right(self.starts, end_date, lo=first)
+        return self.events[first:last]
 
-def parse_date_input(date_str):
-    """Parse date input in m/d/yy format."""
-    try:
-        # Parse as naive datetime, then convert to match timezone-aware datetimes
-        dt = datetime.strptime(date_str.strip(), "%m/%d/%y")
-        # Set to UTC for comparison
-        return dt.replace(tzinfo=timezone.utc)
-    except ValueError:
-        print(f"Invalid date format: {date_str}. Please use m/d/yy format.")
-        sys.exit(1)
 
+class EventRangeView:
+    """The events of one date range, in start order, taken from an EventIndex.
 
-def parse_iso_datetime(iso_string):
-    """Parse ISO 8601 datetime string."""
-    # Handle both with and without timezone
-    if iso_string.endswith('Z'):
-        iso_string = iso_string[:-1] + '+00:00'
-    try:
-        return datetime.fromisoformat(iso_string)
-    except ValueError:
-        return None
+    The same view is enriched by main() and rendered by every output
+    writer, so none of them re-filter or re-sort.
+    """
 
+    def __init__(self, index, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.events = index.between(start_date, end_date)
 
-def fetch_rss_feed(url, max_retries=3):
-    """Fetch RSS feed from URL with retries."""
-    for attempt in range(max_retries):
-        try:
-            # Add small delay before request
-            if attempt > 0:
-                random_delay(1.0, 3.0)
-            
-            response = SESSION.get(url, timeout=15)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            if attempt < max_retries - 1:
-                print(f"  Retry {attempt + 1}/{max_retries - 1} after error: {e}")
-                continue
-            else:
-                print(f"Error fetching RSS feed after {max_retries} attempts: {e}")
-                sys.exit(1)
+    def __iter__(self):
+        return iter(self.events)
 
+    def __len__(self):
+        return len(self.events)
 
-def fetch_event_detail_page(url, max_retries=3):
-    """Fetch event detail page and extract speaker and location info with retries."""
-    for attempt in range(max_retries):
-        try:
-            # Add random delay between requests to be polite
-            random_delay(0.3, 1.0)
-            
-            response = SESSION.get(url, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            speaker = None
-            location = None
-            youtube_link = None
-            
-            # Extract speaker name from .pageTitle > .subtitle
-            page_title = soup.find('div', class_='pageTitle')
-            if page_title:
-                subtitle = page_title.find('div', class_='subtitle')
-                if subtitle:
-                    speaker = subtitle.get_text(strip=True)
-            
-            # Extract location from .event-detail-float .place
-            event_detail_float = soup.find('div', class_='event-detail-float')
-            if event_detail_float:
-                place = event_detail_float.find('div', class_='place')
-                if place:
-                    location = place.get_text(strip=True)
-            
-            # Extract YouTube link from description
-            event_detail_wrap = soup.find('div', class_='event-detail-wrap')
-            if event_detail_wrap:
-                description_wrap = event_detail_wrap.find('div', class_='description-wrap')
-                if description_wrap:
-                    # Look for YouTube link
-                    youtube_match = re.search(r'https://(?:www\.)?youtu\.be/[^\s<"]*', description_wrap.get_text())
-                    if youtube_match:
-                        youtube_link = youtube_match.group(0)
-            
-            return speaker, location, youtube_link
-        except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                print(f"    Timeout, retrying ({attempt + 1}/{max_retries - 1})...")
-                continue
-            else:
-                print(f"    Timeout after {max_retries} attempts, skipping...")
-                return None, None, None
-        except requests.exceptions.RequestException as e:
-            if attempt < max_retries - 1:
-                print(f"    Error: {e}, retrying ({attempt + 1}/{max_retries - 1})...")
-                continue
+
+class DateRanges:
+    """A set of (start_date, end_date) ranges merged for bisect lookups.
+
+    Overlapping and touching ranges are merged into disjoint intervals
+    sorted by start, so testing whether a date falls in any of them is a
+    single bisect however many ranges a batch run has.
+    """
+
+    def __init__(self, ranges):
+        self.starts = []
+        self.ends = []
+        for start_date, end_date in sorted(ranges):
+            if self.ends and start_date <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end_date)
             else:
-                print(f"    Error after {max_retries} attempts, skipping...")
-                return None, None, None
-        except Exception as e:
-            # Silently skip parsing errors
-            return None, None, None
+                self.starts.append(start_date)
+                self.ends.append(end_date)
 
+    def __contains__(self, event):
+        if event.start is None:
+            return False
+        position = bisect_right(self.starts, event.start) - 1
+        return position >= 0 and event.start <= self.ends[position]
 
-def parse_rss_feed(rss_content):
-    """Parse RSS feed XML content."""
-    try:
-        root = ET.fromstring(rss_content)
-        items = []
-        
-        # Define namespaces
-        namespaces = {
-            'ev': 'http://purl.org/rss/1.0/modules/event/',
-            'media': 'http://search.yahoo.com/mrss/'
+
+def union_of_views(views):
+    """Return the events of all `views`, each once, in order of first appearance."""
+    seen = set()
+    events = []
+    for view in views:
+        for event in view:
+            if id(event) not in seen:
+                seen.add(id(event))
+                events.append(event)
+    return events
+
+
+# Marks the end of the work on a pipeline queue
+PIPELINE_DONE = object()
+
+
+class MeteredQueue(queue.Queue):
+    """Bounded queue that tracks its depth and how long producers were blocked."""
+
+    def __init__(self, maxsize):
+        super().__init__(maxsize)
+        self.max_depth = 0
+        self.depth_total = 0
+        self.puts = 0
+        self.blocked_seconds = 0.0
+
+    def put(self, item, block=True, timeout=None):
+        started = time.perf_counter()
+        super().put(item, block, timeout)
+        with self.mutex:
+            self.blocked_seconds += time.perf_counter() - started
+            depth = self._qsize()
+            self.max_depth = max(self.max_depth, depth)
+            self.depth_total += depth
+            self.puts += 1
+
+    def report(self):
+        return {
+            'capacity': self.maxsize,
+            'max_depth': self.max_depth,
+            'mean_depth': self.depth_total / self.puts if self.puts else 0,
+            'producer_blocked_seconds': self.blocked_seconds,
         }
+
+
+class MeteredPriorityQueue(MeteredQueue, queue.PriorityQueue):
+    """MeteredQueue handing out the lowest item first."""
+
+
+class StageMeter:
+    """Busy time of the workers of one pipeline stage."""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.lock = threading.Lock()
+
+    def add(self, seconds, items=1):
+        with self.lock:
+            self.busy_seconds += seconds
+            self.items += items
+
+    def report(self, wall_seconds):
+        capacity = self.workers * wall_seconds
+        return {
+            'workers': self.workers,
+            'items': self.items,
+            'busy_seconds': self.busy_seconds,
+            'utilization': self.busy_seconds / capacity if capacity else 0,
+        }
+
+
+def run_pipeline(feed_ids, ranges, feed_concurrency=DEFAULT_FEED_CONCURRENCY,
+                 detail_workers=DEFAULT_DETAIL_WORKERS, feed_cache=None, plan=True, store=None,
+                 queue_size=DEFAULT_QUEUE_SIZE, budget=None, **fetch_options):
+    """Fetch, filter and enrich events as a streaming pipeline.
+
+    Feed workers stream-parse their feeds onto a bounded queue; a filter
+    stage drops duplicates and out-of-range events and hands events that
+    still need a detail page to the detail workers through a second
+    bounded queue. Events unchanged since a previous run reuse their fields
+    from the `store`. Detail fetches therefore start while feeds are still
+    downloading, those of events starting nearest to now first. Once the
+    `budget` runs out, no more detail pages are fetched. The result is the same as the phased flow in main():
+    (all_events deduplicated by link in feed order, one EventRangeView per
+    (start_date, end_date) in `ranges`).
+    Queue depths and stage utilization are printed and recorded in METRICS.
+    """
+    budget = budget or TimeBudget()
+    now = datetime.now(timezone.utc)
+    parsed = MeteredQueue(queue_size)
+    details = MeteredPriorityQueue(queue_size)
+    queued = itertools.count()
+    meters = {
+        'feeds': StageMeter(feed_concurrency),
+        'filter': StageMeter(1),
+        'details': StageMeter(detail_workers),
+    }
+    date_ranges = DateRanges(ranges)
+    detail_results = {}
+    results_lock = threading.Lock()
+    started = time.perf_counter()
+    
+    def feed_worker(feed_index, feed_id):
+        url = FEED_URL_TEMPLATE.format(base=EVENTS_BASE_URL, feed_id=feed_id)
+        worker_started = time.perf_counter()
+        blocked_before = parsed.blocked_seconds
+        ok = False
+        try:
+            for event in iter_feed_events(url, cache=feed_cache):
+                parsed.put((feed_index, event))
+            ok = True
+        except ET.ParseError as e:
+            print(f"  Error parsing feed ID {feed_id}: {e}")
+        except FetchError as e:
+            print(f"  Feed ID {feed_id}: {e}")
+        except requests.RequestException as e:
+            print(f"  Error reading feed ID {feed_id}: {e}")
+        except Exception as e:
+            # Any other failure loses this feed, but must not stall the filter stage
+            print(f"  Unexpected error in feed ID {feed_id}: {e!r}")
+        finally:
+            # Time spent blocked on the full queue is not work; this is an
+            # approximation when several feed workers block at once
+            busy = time.perf_counter() - worker_started - (parsed.blocked_seconds - blocked_before) / feed_concurrency
+            meters['feeds'].add(max(0.0, busy))
+            parsed.put((feed_index, ok))
+    
+    def detail_worker():
+        while True:
+            _, _, event = details.get()
+            if event is PIPELINE_DONE:
+                return
+            if budget.expired():
+                # Drain the queue so the filter stage never blocks
+                continue
+            fetch_started = time.perf_counter()
+            try:
+                fields = fetch_event_detail_page(event.link, guid=event.guid, **budget.fetch_options(fetch_options))
+            except Exception as e:
+                # The event keeps what its feed item says; the worker must live
+                # on, or the filter stage blocks on the full details queue
+                print(f"  Error fetching details for {event.link}: {e!r}")
+                continue
+            finally:
+                meters['details'].add(time.perf_counter() - fetch_started)
+            with results_lock:
+                detail_results[event.link] = fields
+            print(f"  Fetched details for event {len(detail_results)}: {event.title[:50]}...")
+    
+    detail_threads = [threading.Thread(target=detail_worker, daemon=True) for _ in range(max(1, detail_workers))]
+    for thread in detail_threads:
+        thread.start()
+    
+    events_by_feed = [[] for _ in feed_ids]
+    failed_feeds = set()
+    seen_links = set()
+    planned = 0
+    detail_requests = 0
+    with ThreadPoolExecutor(max_workers=max(1, feed_concurrency)) as executor:
+        for feed_index, feed_id in enumerate(feed_ids):
+            executor.submit(feed_worker, feed_index, feed_id)
         
-        for item in root.findall('.//item'):
-            title = item.find('title')
-            link = item.find('link')
-            guid = item.find('guid')
-            description = item.find('description')
-            category = item.find('category')
-            pubDate = item.find('pubDate')
-            
-            # Get event-specific fields
-            startdate = item.find('ev:startdate', namespaces)
-            enddate = item.find('ev:enddate', namespaces)
-            location = item.find('ev:location', namespaces)
-            organizer = item.find('ev:organizer', namespaces)
-            event_type = item.find('ev:type', namespaces)
-            
-            # Extract GUID for URL generation
-            guid_text = guid.text if guid is not None else ''
-            guid_number = guid_text.split('@')[0] if '@' in guid_text else ''
-            
-            # Generate proper event URL from GUID
-            event_url = f'https://lsa.umich.edu/physics/news-events/all-events.detail.html/{guid_number}.html' if guid_number else ''
-            
-            event = {
-                'title': title.text if title is not None else 'Untitled',
-                'link': event_url,
-                'guid': guid_number,
-                'description': description.text if description is not None else '',
-                'category': category.text if category is not None else '',
-                'pubDate': pubDate.text if pubDate is not None else '',
-                'startdate': startdate.text if startdate is not None else '',
-                'enddate': enddate.text if enddate is not None else '',
-                'location': location.text if location is not None else '',
-                'organizer': organizer.text if organizer is not None else '',
-                'event_type': event_type.text if event_type is not None else '',
-                'speaker': None,  # Will be populated from detail page
-                'detail_location': None,  # Will be populated from detail page
-                'youtube_link': None,  # Will be populated from detail page
-            }
-            items.append(event)
-        
-        return items
-    except ET.ParseError as e:
-        print(f"Error parsing RSS feed: {e}")
-        sys.exit(1)
+        feeds_remaining = len(feed_ids)
+        while feeds_remaining:
+            feed_index, payload = parsed.get()
+            filter_started = time.perf_counter()
+            blocked_before = details.blocked_seconds
+            if isinstance(payload, bool):
+                # End of a feed
+                feeds_remaining -= 1
+                if not payload:
+                    failed_feeds.add(feed_index)
+            else:
+                event = payload
+                events_by_feed[feed_index].append(event)
+                link = event.link
+                if link and link not in seen_links:
+                    seen_links.add(link)
+                    if event in date_ranges and not (store and store.reuse(event)):
+                        planned += 1
+                        if not (plan and apply_feed_fields(event)):
+                            details.put((enrichment_priority(event, now), next(queued), event))
+                            detail_requests += 1
+            meters['filter'].add(time.perf_counter() - filter_started - (details.blocked_seconds - blocked_before))
+    
+    for _ in detail_threads:
+        details.put((float('inf'), next(queued), PIPELINE_DONE))
+    for thread in detail_threads:
+        # Fetches still in flight when the budget runs out are abandoned
+        thread.join(budget.remaining())
+    wall = time.perf_counter() - started
+    # Results that arrive from here on are ignored
+    with results_lock:
+        fetched = dict(detail_results)
+    if len(fetched) < detail_requests:
+        budget.record_unenriched(detail_requests - len(fetched))
+        print(f"  Time budget used up, {detail_requests - len(fetched)} events keep the details from their feed item")
+    
+    all_events = []
+    for feed_index, feed_id in enumerate(feed_ids):
+        if feed_index in failed_feeds:
+            print(f"  Error fetching feed ID {feed_id}, skipping...")
+            continue
+        print(f"  Feed ID {feed_id}: found {len(events_by_feed[feed_index])} events")
+        all_events.extend(events_by_feed[feed_index])
+    print(f"\nTotal events found (raw): {len(all_events)}")
+    all_events = dedupe_by_link(all_events)
+    index = EventIndex(all_events)
+    views = [EventRangeView(index, start_date, end_date) for start_date, end_date in ranges]
+    
+    # The kept occurrence of an event is not necessarily the one that went
+    # through the pipeline first, so results are applied by link
+    for event in union_of_views(views):
+        fields = fetched.get(event.link)
+        if fields is not None:
+            event.speaker, event.detail_location, event.youtube_link = fields
+        elif store and store.reuse(event, count=False):
+            continue
+        elif plan:
+            apply_feed_fields(event)
+    
+    stats = {
+        'wall_seconds': wall,
+        'stages': {name: meter.report(wall) for name, meter in meters.items()},
+        'queues': {'parsed': parsed.report(), 'details': details.report()},
+    }
+    METRICS.set_section('pipeline', stats)
+    print(f"Total events after deduplication by URL: {len(all_events)}")
+    if plan:
+        report_enrichment_plan(planned, detail_requests)
+    print(f"Detail pages fetched: {len(fetched)}")
+    print("Pipeline stage utilization: " + ', '.join(
+        f"{name} {stage['utilization']:.0%} ({stage['workers']} workers)" for name, stage in stats['stages'].items()))
+    print("Pipeline queue depth: " + ', '.join(
+        f"{name} max {q['max_depth']}/{q['capacity']}, mean {q['mean_depth']:.1f}" for name, q in stats['queues'].items()))
+    return all_events, views
 
 
 def extract_time_from_title(title):
@@ -220,8 +2381,8 @@ def extract_end_time_from_title(title, start_time):
 
 def format_time_range(event):
     """Format time range for display."""
-    start_date = parse_iso_datetime(event['startdate'])
-    end_date = parse_iso_datetime(event['enddate'])
+    start_date = event.start
+    end_date = event.end
     
     if not start_date:
         return ''
@@ -235,32 +2396,50 @@ def format_time_range(event):
     return start_time
 
 
+CDATA_RE = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.DOTALL)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+TITLE_DATE_SUFFIX_RE = re.compile(r'\s*\([A-Za-z]+\s+\d{1,2},\s+\d{4}\s+\d{1,2}:\d{2}(?:am|pm)\)\s*$', re.IGNORECASE)
+IN_PERSON_RE = re.compile(r'In-[Pp]erson:\s*(.+?)(?:$|\n|Zoom)', re.MULTILINE)
+TRAILING_COMMA_RE = re.compile(r',\s*$')
+ZOOM_URL_RE = re.compile(r'https://[^\s<"]*zoom\.us[^\s<"]*', re.IGNORECASE)
+# Description lines that never name the speaker
+NON_SPEAKER_LINE_RES = [
+    re.compile(r'^.*?Event Begins:.*?$\n?', re.MULTILINE),
+    re.compile(r'^.*?Location:.*?$\n?', re.MULTILINE),
+    re.compile(r'^.*?Organized By:.*?$\n?', re.MULTILINE),
+]
+SPEAKER_AFFILIATION_RE = re.compile(r'^(.+?)\s*\(([^)]+)\)\s*$', re.MULTILINE)
+
+
 def clean_html_description(description):
     """Clean HTML/CDATA from description."""
     # Remove CDATA tags if present
-    description = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', description, flags=re.DOTALL)
+    description = CDATA_RE.sub(r'\1', description)
     # Remove HTML tags but keep some structure
-    description = re.sub(r'<[^>]+>', '', description)
+    description = HTML_TAG_RE.sub('', description)
     return description.strip()
 
 
 def clean_event_title(title):
     """Remove parenthetical date and time from event title."""
     # Remove pattern like " (December 17, 2025 12:00pm)" at the end
-    cleaned = re.sub(r'\s*\([A-Za-z]+\s+\d{1,2},\s+\d{4}\s+\d{1,2}:\d{2}(?:am|pm)\)\s*$', '', title, flags=re.IGNORECASE)
+    cleaned = TITLE_DATE_SUFFIX_RE.sub('', title)
     return cleaned.strip()
 
 
 def extract_location_from_description(description):
     """Extract in-person location from description if available."""
-    cleaned = clean_html_description(description)
-    
+    return location_from_clean_description(clean_html_description(description))
+
+
+def location_from_clean_description(cleaned):
+    """Extract in-person location from an already cleaned description."""
     # Look for "In-person:" or "In-Person:" pattern
-    match = re.search(r'In-[Pp]erson:\s*(.+?)(?:$|\n|Zoom)', cleaned, re.MULTILINE)
+    match = IN_PERSON_RE.search(cleaned)
     if match:
         location = match.group(1).strip()
         # Remove any trailing commas or extra whitespace
-        location = re.sub(r',\s*$', '', location).strip()
+        location = TRAILING_COMMA_RE.sub('', location).strip()
         # If it contains extra details (address, room number), just get the main location
         if ',' in location:
             location = location.split(',')[0].strip()
@@ -288,209 +2467,308 @@ def titlecase(text):
     return ' '.join(result)
 
 
-def extract_speaker_from_description(description, title):
-    """Extract speaker/organizer from description."""
-    # Look for common patterns in description
-    cleaned = clean_html_description(description)
-    
-    # Remove "Event Begins:" line as it's redundant
-    cleaned = re.sub(r'^.*?Event Begins:.*?$\n?', '', cleaned, flags=re.MULTILINE)
-    # Remove "Location:" line as we display it separately
-    cleaned = re.sub(r'^.*?Location:.*?$\n?', '', cleaned, flags=re.MULTILINE)
-    # Remove "Organized By:" line
-    cleaned = re.sub(r'^.*?Organized By:.*?$\n?', '', cleaned, flags=re.MULTILINE)
+def extract_speaker_from_description(description, title, require_affiliation=False):
+    """Extract speaker/organizer from description.
+
+    With `require_affiliation`, only a "Name (Affiliation)" first line is
+    accepted and '' is returned otherwise.
+    """
+    return speaker_from_clean_description(clean_html_description(description), require_affiliation)
+
+
+def speaker_from_clean_description(cleaned, require_affiliation=False):
+    """Extract speaker/organizer from an already cleaned description."""
+    for pattern in NON_SPEAKER_LINE_RES:
+        cleaned = pattern.sub('', cleaned)
     
     # Pattern: "Name (Institution/Affiliation)"
-    match = re.search(r'^(.+?)\s*\(([^)]+)\)\s*$', cleaned.split('\n')[0], re.MULTILINE)
+    first_line = cleaned.split('\n')[0]
+    match = SPEAKER_AFFILIATION_RE.search(first_line)
     if match:
         return match.group(1).strip()
+    if require_affiliation:
+        return ''
     
     # If not found, try to extract from first line
-    first_line = cleaned.split('\n')[0].strip()
+    first_line = first_line.strip()
     if first_line and len(first_line) < 200:  # Reasonable speaker name length
         return first_line
     
     return ''
 
 
-def generate_html_output(events, start_date, end_date, output_dir):
-    """Generate HTML output grouped by date."""
-    # Filter events by date range and remove duplicates
-    filtered_events = []
-    seen_guids = set()
-    
-    for event in events:
-        event_date = parse_iso_datetime(event['startdate'])
-        if event_date and start_date <= event_date <= end_date:
-            # Skip duplicate events (same GUID)
-            guid = event.get('guid', '')
-            if guid and guid in seen_guids:
-                continue
-            if guid:
-                seen_guids.add(guid)
-            filtered_events.append(event)
-    
-    # Sort by start date and time
-    filtered_events.sort(key=lambda e: parse_iso_datetime(e['startdate']) or datetime.min)
-    
-    # Group by date
-    events_by_date = defaultdict(list)
-    for event in filtered_events:
-        event_date = parse_iso_datetime(event['startdate'])
-        if event_date:
-            date_key = event_date.strftime('%Y-%m-%d')
-            events_by_date[date_key].append(event)
-    
-    # Sort events within each day by start time
-    for date_key in events_by_date:
-        events_by_date[date_key].sort(key=lambda e: parse_iso_datetime(e['startdate']) or datetime.min)
-    
-    # Format date range for title
-    start_display = start_date.strftime('%m/%d/%Y')
-    end_display = end_date.strftime('%m/%d/%Y')
-    title = f"Physics Seminars & Colloquia | {start_display} - {end_display}"
-    
-    # Build HTML
-    html_parts = [
-        '<!DOCTYPE html>',
-        '<html>',
-        '<head><meta charset="UTF-8"><title>' + title + '</title></head>',
-        '<body style="font-family: Arial, sans-serif; font-size: 10pt; color: black;">',
-        f'<h1>{title}</h1>',
-    ]
-    
-    for date_key in sorted(events_by_date.keys()):
-        event_date = datetime.strptime(date_key, '%Y-%m-%d')
-        date_display = event_date.strftime('%A, %B %d, %Y')
+@contextmanager
+def atomic_output(path, newline=None):
+    """Open `path` for writing text through a temporary file in the same directory.
+
+    The temporary file replaces `path` only when the block completes, so a
+    crash or error mid-render leaves the previous output (or nothing) in
+    place rather than a half-written file.
+    """
+    # Ranges render concurrently, so the name is unique per thread as well as per process
+    tmp_path = path + f'.{os.getpid()}.{threading.get_ident()}.tmp'
+    f = open(tmp_path, 'w', encoding='utf-8', newline=newline)
+    try:
+        with f:
+            yield f
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+class HtmlDigestWriter:
+    """Streams the HTML digest, grouped by date, to an open text file.
+
+    Events must arrive sorted by start time; a date heading is written
+    whenever the start date changes, so nothing is held in memory.
+    """
+
+    def __init__(self, f, start_date, end_date):
+        self.f = f
+        self.start_date = start_date
+        self.end_date = end_date
+        self._date_key = None
+        self._started = False
+
+    def _write(self, part):
+        # Parts are newline-separated, without a trailing newline
+        if self._started:
+            self.f.write('\n')
+        self._started = True
+        self.f.write(part)
+
+    def begin(self):
+        # Format date range for title
+        start_display = self.start_date.strftime('%m/%d/%Y')
+        end_display = self.end_date.strftime('%m/%d/%Y')
+        title = f"Physics Seminars & Colloquia | {start_display} - {end_display}"
+        
+        for part in (
+            '<!DOCTYPE html>',
+            '<html>',
+            '<head><meta charset="UTF-8"><title>' + title + '</title></head>',
+            '<body style="font-family: Arial, sans-serif; font-size: 10pt; color: black;">',
+            f'<h1>{title}</h1>',
+        ):
+            self._write(part)
+
+    def write_event(self, event):
+        date_key = event.start.strftime('%Y-%m-%d')
+        if date_key != self._date_key:
+            self._date_key = date_key
+            date_display = event.start.strftime('%A, %B %d, %Y')
+            self._write(
+                f'<div style="margin-bottom: 5px;">'
+                f'<a href="{LSA_BASE_URL}/physics/news-events/all-events.html#date={date_key}&view=day" '
+                f'style="color: #0b769f; font-weight: bold; text-decoration: underline;" target="_blank">{date_display}</a>'
+                f'</div>'
+            )
+        
+        time_range = format_time_range(event)
+        title_text = event.display_title
+        link = event.link
+        
+        # Use detail location if available, otherwise fall back to base location
+        location = event.display_location
         
-        html_parts.append(
-            f'<div style="margin-bottom: 5px;">'
-            f'<a href="https://lsa.umich.edu/physics/news-events/all-events.html#date={date_key}&view=day" '
-            f'style="color: #0b769f; font-weight: bold; text-decoration: underline;" target="_blank">{date_display}</a>'
-            f'</div>'
+        speaker = event.speaker
+        youtube_link = event.youtube_link
+        zoom_url = event.zoom_url
+        
+        self._write(
+            f'<div style="margin-bottom: 20px;">'
+            f'<div>{time_range}</div>'
+            f'<div style="font-weight: bold;"><a href="{link}" '
+            f'style="color: black; text-decoration: underline;" target="_blank">{title_text}</a></div>'
         )
         
-        for event in events_by_date[date_key]:
-            time_range = format_time_range(event)
-            title_text = titlecase(clean_event_title(event['title']))
-            link = event['link']
-            
-            # Use detail location if available, otherwise fall back to base location
-            location = event['detail_location'] or extract_location_from_description(event['description']) or event['location']
-            
-            speaker = event['speaker']
-            youtube_link = event['youtube_link']
-            
-            # Find zoom link in description
-            description = clean_html_description(event['description'])
-            zoom_match = re.search(r'https://[^\s<"]*zoom\.us[^\s<"]*', description, re.IGNORECASE)
-            zoom_url = zoom_match.group(0) if zoom_match else None
-            
-            html_parts.append(
-                f'<div style="margin-bottom: 20px;">'
-                f'<div>{time_range}</div>'
-                f'<div style="font-weight: bold;"><a href="{link}" '
-                f'style="color: black; text-decoration: underline;" target="_blank">{title_text}</a></div>'
+        if speaker:
+            self._write(f'<div style="font-style: italic;">{speaker}</div>')
+        
+        if location:
+            self._write(f'<div style="font-weight: bold;">{location}</div>')
+        
+        if zoom_url:
+            self._write(
+                f'<div style="">Event will be on Zoom: <a href="{zoom_url}" target="_blank">{zoom_url}</a></div>'
+            )
+        
+        if youtube_link:
+            self._write(
+                f'<div style="">The event will be livestreamed: <a href="{youtube_link}" target="_blank">{youtube_link}</a></div>'
             )
-            
-            if speaker:
-                html_parts.append(f'<div style="font-style: italic;">{speaker}</div>')
-            
-            if location:
-                html_parts.append(f'<div style="font-weight: bold;">{location}</div>')
-            
-            if zoom_url:
-                html_parts.append(
-                    f'<div style="">Event will be on Zoom: <a href="{zoom_url}" target="_blank">{zoom_url}</a></div>'
-                )
-            
-            if youtube_link:
-                html_parts.append(
-                    f'<div style="">The event will be livestreamed: <a href="{youtube_link}" target="_blank">{youtube_link}</a></div>'
-                )
-            
-            html_parts.append('</div>')
-    
-    html_parts.extend([
-        '</body>',
-        '</html>'
-    ])
-    
-    return '\n'.join(html_parts)
-
-
-def generate_google_calendar_csv(events, start_date, end_date, csv_path):
-    """Generate CSV file for Google Calendar import."""
-    # Filter events by date range and remove duplicates
-    filtered_events = []
-    seen_guids = set()
+        
+        self._write('</div>')
+
+    def end(self):
+        self._write('</body>')
+        self._write('</html>')
+
+
+def calendar_description(event):
+    """Return the description text used for `event` in calendar exports."""
+    description_parts = []
+    if event.speaker:
+        description_parts.append(f"Speaker: {event.speaker}")
+    if event.link:
+        description_parts.append(f"Event page: {event.link}")
     
-    for event in events:
-        event_date = parse_iso_datetime(event['startdate'])
-        if event_date and start_date <= event_date <= end_date:
-            guid = event.get('guid', '')
-            if guid and guid in seen_guids:
-                continue
-            if guid:
-                seen_guids.add(guid)
-            filtered_events.append(event)
-    
-    # Sort by start date
-    filtered_events.sort(key=lambda e: parse_iso_datetime(e['startdate']) or datetime.min)
-    
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = [
-            'Subject',
-            'Start Date',
-            'Start Time',
-            'End Date',
-            'End Time',
-            'Description',
-            'Location',
-            'Speaker'
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+    # Find zoom link
+    if event.zoom_url:
+        description_parts.append(f"Zoom: {event.zoom_url}")
+    
+    # Find youtube link
+    if event.youtube_link:
+        description_parts.append(f"YouTube: {event.youtube_link}")
+    
+    return '\n'.join(description_parts)
+
+
+class GoogleCalendarCsvWriter:
+    """Streams events as Google Calendar import CSV rows to an open text file.
+
+    The file must be opened with newline='' as the csv module requires.
+    """
+
+    FIELDNAMES = [
+        'Subject',
+        'Start Date',
+        'Start Time',
+        'End Date',
+        'End Time',
+        'Description',
+        'Location',
+        'Speaker'
+    ]
+
+    def __init__(self, f):
+        self.writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
+
+    def begin(self):
+        self.writer.writeheader()
+
+    def write_event(self, event):
+        start_dt = event.start
+        end_dt = event.end
         
-        for event in filtered_events:
-            start_dt = parse_iso_datetime(event['startdate'])
-            end_dt = parse_iso_datetime(event['enddate'])
-            
-            if not start_dt:
-                continue
-            
-            title_text = titlecase(clean_event_title(event['title']))
-            location = event['detail_location'] or extract_location_from_description(event['description']) or event['location']
-            speaker = event['speaker'] or ''
-            
-            # Build description
-            description_parts = []
-            if speaker:
-                description_parts.append(f"Speaker: {speaker}")
-            if event['link']:
-                description_parts.append(f"Event page: {event['link']}")
-            
-            # Find zoom link
-            zoom_match = re.search(r'https://[^\s<"]*zoom\.us[^\s<"]*', clean_html_description(event['description']), re.IGNORECASE)
-            if zoom_match:
-                description_parts.append(f"Zoom: {zoom_match.group(0)}")
-            
-            # Find youtube link
-            if event['youtube_link']:
-                description_parts.append(f"YouTube: {event['youtube_link']}")
-            
-            description = '\n'.join(description_parts)
-            
-            writer.writerow({
-                'Subject': title_text,
-                'Start Date': start_dt.strftime('%m/%d/%Y'),
-                'Start Time': start_dt.strftime('%I:%M %p'),
-                'End Date': end_dt.strftime('%m/%d/%Y') if end_dt else start_dt.strftime('%m/%d/%Y'),
-                'End Time': end_dt.strftime('%I:%M %p') if end_dt else '',
-                'Description': description,
-                'Location': location or '',
-                'Speaker': speaker
-            })
+        title_text = event.display_title
+        location = event.display_location
+        speaker = event.speaker or ''
+        description = calendar_description(event)
+        
+        self.writer.writerow({
+            'Subject': title_text,
+            'Start Date': start_dt.strftime('%m/%d/%Y'),
+            'Start Time': start_dt.strftime('%I:%M %p'),
+            'End Date': end_dt.strftime('%m/%d/%Y') if end_dt else start_dt.strftime('%m/%d/%Y'),
+            'End Time': end_dt.strftime('%I:%M %p') if end_dt else '',
+            'Description': description,
+            'Location': location or '',
+            'Speaker': speaker
+        })
+
+    def end(self):
+        pass
+
+
+class IcsCalendarWriter:
+    """Streams events as an iCalendar (RFC 5545) VCALENDAR to an open text file.
+
+    The GUID the feed sent (e.g. "<number>@events.umich.edu") is used as
+    each VEVENT's UID so calendar clients update events on re-import
+    instead of duplicating them; events without one get a UID derived from
+    their title and start time. Timezone-aware start
+    and end times are written in UTC; naive ones as floating local times.
+    The file must be opened with newline='' to keep the CRLF line endings.
+    """
+
+    PRODID = '-//physics-events-rss-scraper//Physics Seminars & Colloquia//EN'
+
+    def __init__(self, f, start_date, end_date):
+        self.f = f
+        self.start_date = start_date
+        self.end_date = end_date
+        self.dtstamp = self.format_datetime(datetime.now(timezone.utc))
+
+    @staticmethod
+    def escape(text):
+        return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+                .replace('\r\n', '\n').replace('\n', '\\n'))
+
+    @staticmethod
+    def format_datetime(value):
+        if value.tzinfo is None:
+            return value.strftime('%Y%m%dT%H%M%S')
+        return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    def _write(self, name, value):
+        # Fold content lines longer than 75 octets (RFC 5545 section 3.1)
+        line = f'{name}:{value}'.encode('utf-8')
+        folded = []
+        while len(line) > 75:
+            cut = 75 if not folded else 74
+            # Never split inside a multi-byte UTF-8 sequence
+            while line[cut] & 0xC0 == 0x80:
+                cut -= 1
+            folded.append(line[:cut])
+            line = line[cut:]
+        folded.append(line)
+        self.f.write('\r\n '.join(part.decode('utf-8') for part in folded) + '\r\n')
+
+    def begin(self):
+        start_display = self.start_date.strftime('%m/%d/%Y')
+        end_display = self.end_date.strftime('%m/%d/%Y')
+        self._write('BEGIN', 'VCALENDAR')
+        self._write('VERSION', '2.0')
+        self._write('PRODID', self.PRODID)
+        self._write('CALSCALE', 'GREGORIAN')
+        self._write('METHOD', 'PUBLISH')
+        self._write('X-WR-CALNAME', self.escape(f"Physics Seminars & Colloquia | {start_display} - {end_display}"))
+
+    @staticmethod
+    def uid(event):
+        """Return a globally unique UID for `event` that stays the same across runs."""
+        if event.feed_guid:
+            return event.feed_guid
+        digest = hashlib.sha1(f"{event.title}\n{event.startdate}".encode('utf-8')).hexdigest()
+        return f"{digest}@{urlsplit(EVENTS_BASE_URL).hostname}"
+
+    def write_event(self, event):
+        self._write('BEGIN', 'VEVENT')
+        self._write('UID', self.escape(self.uid(event)))
+        self._write('DTSTAMP', self.dtstamp)
+        self._write('DTSTART', self.format_datetime(event.start))
+        if event.end and event.end > event.start:
+            self._write('DTEND', self.format_datetime(event.end))
+        self._write('SUMMARY', self.escape(event.display_title))
+        location = event.display_location
+        if location:
+            self._write('LOCATION', self.escape(location))
+        description = calendar_description(event)
+        if description:
+            self._write('DESCRIPTION', self.escape(description))
+        if event.link:
+            self._write('URL', event.link)
+        self._write('END', 'VEVENT')
+
+    def end(self):
+        self._write('END', 'VCALENDAR')
+
+
+def render_events(events, writers):
+    """Feed each event from the iterator `events` to every writer in a single pass.
+
+    Events must be sorted by start time and all have a start time, as the
+    events of an EventRangeView do.
+    """
+    for writer in writers:
+        writer.begin()
+    for event in events:
+        for writer in writers:
+            writer.write_event(event)
+    for writer in writers:
+        writer.end()
 
 
 def sanitize_filename(name, max_length=200):
@@ -514,104 +2792,442 @@ def sanitize_filename(name, max_length=200):
     return safe
 
 
-def main():
-    # Feed IDs to iterate through
-    feed_ids = [1965, 1178, 3798, 3799, 3767, 3801, 3811, 3247, 3804, 3805, 3806, 3807, 3813, 4897, 3606, 5034]
+RELATIVE_RANGE_RE = re.compile(r'^(next|last|past)\s+(\d+)\s+(day|week)s?$')
+
+
+def parse_relative_range(text, today=None):
+    """Parse a relative date range such as "next 14 days".
+
+    Accepted forms are "today", "tomorrow", "this week", "next week" (weeks
+    run Monday to Sunday), "next N days|weeks" starting today and
+    "last N days|weeks" ending today. Returns (start_date, end_date) in the
+    same form as `parse_date_input`, or None if `text` is not recognised.
+    """
+    today = today or datetime.now().date()
+    midnight = datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
+    text = ' '.join(text.lower().split())
+    if text == 'today':
+        return midnight, midnight + timedelta(days=1)
+    if text == 'tomorrow':
+        return midnight + timedelta(days=1), midnight + timedelta(days=2)
+    if text in ('this week', 'next week'):
+        monday = midnight - timedelta(days=today.weekday())
+        if text == 'next week':
+            monday += timedelta(days=7)
+        # Like "today", end at the following midnight so Sunday's events are included
+        return monday, monday + timedelta(days=7)
+    match = RELATIVE_RANGE_RE.match(text)
+    if not match:
+        return None
+    direction, count, unit = match.groups()
+    length = timedelta(days=int(count) * (7 if unit == 'week' else 1))
+    if direction == 'next':
+        return midnight, midnight + length
+    return midnight - length, midnight
+
+
+def date_argument(value):
+    """argparse type for m/d/yy dates."""
+    try:
+        return datetime.strptime(value.strip(), "%m/%d/%y").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', use m/d/yy format")
+
+
+def range_argument(value):
+    """argparse type for relative date ranges."""
+    date_range = parse_relative_range(value)
+    if date_range is None:
+        raise argparse.ArgumentTypeError(
+            f"invalid range '{value}', use e.g. 'next 14 days', 'last 2 weeks', 'this week' or 'next week'")
+    return date_range
+
+
+def span_argument(value):
+    """argparse type for an explicit M/D/YY-M/D/YY date range."""
+    start, sep, end = value.partition('-')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"invalid range '{value}', use M/D/YY-M/D/YY")
+    start_date, end_date = date_argument(start), date_argument(end)
+    if start_date > end_date:
+        raise argparse.ArgumentTypeError(f"invalid range '{value}', start date must be before end date")
+    return start_date, end_date
+
+
+def weekly_ranges(start_date, end_date):
+    """Split `start_date`..`end_date` into consecutive week-long ranges.
+
+    Each range starts where the previous one ended, like the ranges of
+    "next N weeks"; the last one is cut short at `end_date`.
+    """
+    ranges = []
+    week_start = start_date
+    while week_start < end_date:
+        week_end = min(week_start + timedelta(days=7), end_date)
+        ranges.append((week_start, week_end))
+        week_start = week_end
+    return ranges or [(start_date, end_date)]
+
+
+def feed_ids_argument(value):
+    """argparse type for a comma-separated list of feed IDs."""
+    try:
+        return [int(feed_id) for feed_id in value.split(',') if feed_id.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid feed ID list '{value}', use e.g. 1965,1178")
+
+
+def parse_args(argv=None):
+    """Parse command-line options.
+
+    Giving a date range (--start/--end or --range) or a batch of ranges
+    (--batch or --weekly) runs without prompting, so the scraper can be
+    scheduled. Without one, the dates are asked for interactively once the
+    feeds have been fetched. `args.ranges` holds the (start_date, end_date)
+    ranges to render, or None when they are to be asked for.
+    """
+    parser = argparse.ArgumentParser(description="Build a digest of physics seminars and colloquia.")
+    
+    dates = parser.add_argument_group('date range')
+    dates.add_argument('--start', type=date_argument, metavar='M/D/YY', help="first day of the digest")
+    dates.add_argument('--end', type=date_argument, metavar='M/D/YY', help="last day of the digest")
+    dates.add_argument('--range', type=range_argument, dest='relative_range', metavar='RANGE',
+                       help="relative range instead of --start/--end: 'today', 'tomorrow', 'this week', "
+                            "'next week', 'next N days|weeks' or 'last N days|weeks'")
+    dates.add_argument('--batch', type=span_argument, nargs='+', action='extend', dest='batch_ranges',
+                       metavar='M/D/YY-M/D/YY',
+                       help="render a digest for each of these ranges from a single fetch")
+    dates.add_argument('--weekly', type=span_argument, metavar='M/D/YY-M/D/YY',
+                       help="render a digest for each week of this range from a single fetch")
+    
+    fetching = parser.add_argument_group('fetching')
+    fetching.add_argument('--feeds', type=feed_ids_argument, default=FEED_IDS, metavar='ID,ID,...',
+                          help="comma-separated group feed IDs (default: all physics groups)")
+    fetching.add_argument('--feed-concurrency', type=int, default=DEFAULT_FEED_CONCURRENCY,
+                          help=f"number of group feeds to fetch in parallel; 1 fetches them one at a time "
+                               f"(default: {DEFAULT_FEED_CONCURRENCY})")
+    fetching.add_argument('--detail-workers', type=int, default=DEFAULT_DETAIL_WORKERS,
+                          help=f"number of event detail pages to fetch in parallel (default: {DEFAULT_DETAIL_WORKERS})")
+    fetching.add_argument('--requests-per-second', type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                          help=f"maximum sustained request rate per host; 0 disables the limit "
+                               f"(default: {DEFAULT_REQUESTS_PER_SECOND})")
+    fetching.add_argument('--burst', type=int, default=DEFAULT_BURST,
+                          help=f"number of requests per host allowed back to back before the rate "
+                               f"limit applies (default: {DEFAULT_BURST})")
+    fetching.add_argument('--fixed-concurrency', action='store_true',
+                          help="always keep --feed-concurrency / --detail-workers requests in flight, instead "
+                               "of backing off per host on timeouts, 429s and 5xx and ramping back up while "
+                               "responses are fast")
+    fetching.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                          help=f"attempts per request before giving up (default: {DEFAULT_MAX_ATTEMPTS})")
+    fetching.add_argument('--max-backoff', type=float, default=DEFAULT_MAX_BACKOFF,
+                          help=f"longest wait in seconds between attempts, including waits asked for "
+                               f"by Retry-After (default: {DEFAULT_MAX_BACKOFF:g})")
+    fetching.add_argument('--breaker-failures', type=int, default=DEFAULT_BREAKER_FAILURES,
+                          help=f"consecutive failed requests after which a host is left alone for "
+                               f"--breaker-cooldown seconds; 0 disables this (default: {DEFAULT_BREAKER_FAILURES})")
+    fetching.add_argument('--breaker-cooldown', type=float, default=DEFAULT_BREAKER_COOLDOWN,
+                          help=f"seconds a failing host is left alone before it is tried again "
+                               f"(default: {DEFAULT_BREAKER_COOLDOWN:g})")
+    fetching.add_argument('--request-deadline', type=float, default=DEFAULT_REQUEST_DEADLINE,
+                          help=f"seconds a detail page may take to arrive in full before the attempt is "
+                               f"abandoned; 0 disables the deadline (default: {DEFAULT_REQUEST_DEADLINE:g})")
+    fetching.add_argument('--hedge-fraction', type=float, default=0.0,
+                          help="re-request detail pages that take longer than the p95 of recent ones "
+                               "and use whichever copy arrives first, adding at most this fraction of "
+                               "extra requests, e.g. 0.05; 0 disables hedging (default: 0)")
+    fetching.add_argument('--time-budget', type=float, metavar='SECONDS',
+                          help="finish the run within about this many seconds: detail pages are fetched "
+                               "for the events starting soonest first, and events not reached in time use "
+                               "what their feed item says (default: no limit)")
+    fetching.add_argument('--http2', action='store_true',
+                          help="fetch with httpx instead of requests, multiplexing requests to a host over "
+                               "one HTTP/2 connection where the server supports it (needs httpx[http2])")
+    fetching.add_argument('--extractor', choices=DETAIL_EXTRACTOR_CHOICES, default='auto',
+                          help="detail page parser: 'auto' uses selectolax or lxml when installed and "
+                               "BeautifulSoup otherwise (default: auto)")
+    fetching.add_argument('--always-fetch-details', action='store_true',
+                          help="fetch the detail page of every event, even when its feed item already "
+                               "provides the speaker and location")
+    fetching.add_argument('--max-detail-bytes', type=int, default=DEFAULT_MAX_DETAIL_BYTES,
+                          help=f"stop downloading a detail page after this many bytes (default: {DEFAULT_MAX_DETAIL_BYTES})")
+    fetching.add_argument('--full-detail-pages', action='store_true',
+                          help="download detail pages to the end instead of stopping once the "
+                               "needed blocks have been read")
+    fetching.add_argument('--events-base-url', default=EVENTS_BASE_URL,
+                          help=f"base URL of the group feeds (default: {EVENTS_BASE_URL})")
+    fetching.add_argument('--lsa-base-url', default=LSA_BASE_URL,
+                          help=f"base URL of the event detail pages (default: {LSA_BASE_URL})")
+    
+    caching = parser.add_argument_group('caching')
+    caching.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                         help=f"directory for caches kept between runs (default: {DEFAULT_CACHE_DIR})")
+    caching.add_argument('--no-cache', action='store_true',
+                         help="do not read or write any cache")
+    caching.add_argument('--detail-cache-ttl', type=float, default=DEFAULT_DETAIL_CACHE_TTL / 3600,
+                         help=f"hours a cached detail page is used before it is revalidated "
+                              f"(default: {DEFAULT_DETAIL_CACHE_TTL // 3600})")
+    caching.add_argument('--detail-cache-size', type=int, default=DEFAULT_DETAIL_CACHE_SIZE,
+                         help=f"maximum number of detail pages kept in the cache (default: {DEFAULT_DETAIL_CACHE_SIZE})")
+    caching.add_argument('--full-refresh', action='store_true',
+                         help="enrich every event in range again instead of reusing the fields stored "
+                              "for events whose feed item has not changed")
+    caching.add_argument('--offline', action='store_true',
+                         help="use only cached feeds and detail pages, without any network requests")
+    
+    pipelining = parser.add_argument_group('pipelining')
+    pipelining.add_argument('--pipeline', action='store_true',
+                            help="start detail fetches while feeds are still downloading; needs "
+                                 "the date range up front")
+    pipelining.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                            help=f"capacity of the queues between pipeline stages (default: {DEFAULT_QUEUE_SIZE})")
     
+    output = parser.add_argument_group('output')
+    output.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help=f"directory the digest files are written to (default: {DEFAULT_OUTPUT_DIR})")
+    output.add_argument('--metrics-json', default='run-metrics.json',
+                        help="where to write the timing and request metrics of the run; "
+                             "an empty value disables the report (default: run-metrics.json)")
+    
+    args = parser.parse_args(argv)
+    if args.relative_range and (args.start or args.end):
+        parser.error("--range cannot be combined with --start/--end")
+    if (args.batch_ranges or args.weekly) and (args.start or args.end or args.relative_range):
+        parser.error("--batch and --weekly cannot be combined with --start/--end or --range")
+    if bool(args.start) != bool(args.end):
+        parser.error("--start and --end must be given together")
+    if args.no_cache and args.offline:
+        parser.error("--offline needs the cache, it cannot be combined with --no-cache")
+    if args.http2 and httpx is None:
+        parser.error("--http2 needs httpx, install it with: pip install 'httpx[http2]'")
+    if args.relative_range:
+        args.start, args.end = args.relative_range
+    if args.start and args.start > args.end:
+        parser.error("start date must be before end date")
+    args.ranges = None
+    if args.start:
+        args.ranges = [(args.start, args.end)]
+    if args.batch_ranges or args.weekly:
+        args.ranges = list(args.batch_ranges or [])
+        if args.weekly:
+            args.ranges.extend(weekly_ranges(*args.weekly))
+        # The same range given twice (or a --batch range that is also a --weekly week) is rendered once
+        args.ranges = list(dict.fromkeys(args.ranges))
+    if args.pipeline and not args.ranges:
+        parser.error("--pipeline needs the date range up front (--start/--end, --range, --batch or --weekly)")
+    return args
+
+
+def run_phased(args, feed_ids, feed_cache, fetch_options, store=None, budget=None):
+    """Fetch all feeds, then ask for (or take) the date ranges, then fetch
+    the detail pages of the events in any of them.
+
+    Returns (all_events, views), with one EventRangeView per range.
+    """
     # Aggregate events from all feeds
     all_events = []
     
     print(f"Fetching and parsing {len(feed_ids)} RSS feeds...\n")
-    for feed_id in feed_ids:
-        url = f"https://events.umich.edu/group/{feed_id}/rss?v=2&html_output=true"
-        try:
-            print(f"Fetching feed ID {feed_id}...")
-            rss_content = fetch_rss_feed(url)
-            events = parse_rss_feed(rss_content)
-            print(f"  Found {len(events)} events")
-            all_events.extend(events)
-            # Add delay between feed fetches
-            random_delay(0.5, 1.5)
-        except SystemExit:
+    with METRICS.phase('fetch_feeds'):
+        feed_results = fetch_all_feeds(feed_ids, concurrency=args.feed_concurrency, cache=feed_cache)
+    for feed_id, events in feed_results:
+        if events is None:
             print(f"  Error fetching feed ID {feed_id}, skipping...")
             continue
+        print(f"  Feed ID {feed_id}: found {len(events)} events")
+        all_events.extend(events)
     
     print(f"\nTotal events found (raw): {len(all_events)}")
 
-    # Deduplicate events by URL to avoid fetching the same event page twice.
-    # Keep the first occurrence of each unique `link` value. If `link` is
-    # empty we do not consider it for deduplication (those remain as-is).
-    deduped_events = []
-    seen_links = set()
-    for ev in all_events:
-        link = ev.get('link') or ''
-        if link:
-            if link in seen_links:
-                continue
-            seen_links.add(link)
-        deduped_events.append(ev)
-
-    all_events = deduped_events
+    # Deduplicate events by URL to avoid fetching the same event page twice
+    all_events = dedupe_by_link(all_events)
     print(f"Total events after deduplication by URL: {len(all_events)}")
     
-    # Get date range from user
-    print("\nEnter start date (m/d/yy format):")
-    start_date = parse_date_input(input())
+    ranges = args.ranges
+    if ranges:
+        print()
+        print_ranges(ranges)
+    else:
+        # Get date range from user
+        print("\nEnter start date (m/d/yy format):")
+        start_date = parse_date_input(input())
+        
+        print("Enter end date (m/d/yy format):")
+        end_date = parse_date_input(input())
+        
+        if start_date > end_date:
+            print("Error: Start date must be before end date")
+            sys.exit(1)
+        ranges = [(start_date, end_date)]
     
-    print("Enter end date (m/d/yy format):")
-    end_date = parse_date_input(input())
+    # Filter events within the date ranges first
+    with METRICS.phase('filter_range'):
+        index = EventIndex(all_events)
+        views = [EventRangeView(index, start_date, end_date) for start_date, end_date in ranges]
+        events_in_range = union_of_views(views)
     
-    if start_date > end_date:
-        print("Error: Start date must be before end date")
-        sys.exit(1)
+    print(f"Events within date range: {len(events_in_range)}")
     
-    # Filter events within date range first
-    events_in_range = []
-    for event in all_events:
-        event_date = parse_iso_datetime(event['startdate'])
-        if event_date and start_date <= event_date <= end_date:
-            events_in_range.append(event)
+    # Events whose feed item is unchanged since an earlier run keep the
+    # fields enriched then
+    events_to_enrich = events_in_range
+    if store:
+        events_to_enrich = [event for event in events_in_range if not store.reuse(event)]
     
-    print(f"Events within date range: {len(events_in_range)}")
+    # Fetch detail pages only for events within the date range whose feed
+    # item does not already tell us everything
+    if not args.always_fetch_details:
+        linked = sum(1 for event in events_to_enrich if event.link)
+        with METRICS.phase('plan_enrichment'):
+            events_to_enrich = plan_enrichment(events_to_enrich)
+        report_enrichment_plan(linked, len(events_to_enrich))
     
-    # Fetch detail pages only for events within the date range
     print("\nFetching event details...")
-    for i, event in enumerate(events_in_range):
-        if event['link']:
-            print(f"  Fetching details for event {i+1}/{len(events_in_range)}: {event['title'][:50]}...")
-            speaker, detail_location, youtube_link = fetch_event_detail_page(event['link'])
-            event['speaker'] = speaker
-            event['detail_location'] = detail_location
-            event['youtube_link'] = youtube_link
+    with METRICS.phase('enrich_details'):
+        enrich_events(events_to_enrich, workers=args.detail_workers, budget=budget, **fetch_options)
+    return all_events, views
+
+
+def print_ranges(ranges):
+    """Print the date ranges a run renders."""
+    if len(ranges) > 1:
+        print(f"Date ranges ({len(ranges)}):")
+    for start_date, end_date in ranges:
+        label = "  " if len(ranges) > 1 else "Date range: "
+        print(f"{label}{start_date.strftime('%m/%d/%Y')} - {end_date.strftime('%m/%d/%Y')}")
+
+
+def render_range(view, output_dir):
+    """Write the HTML digest, Google Calendar CSV and iCalendar file of `view`.
+
+    Returns the paths written.
+    """
+    # Format date range for filenames
+    start_display = view.start_date.strftime('%m-%d-%Y')
+    end_display = view.end_date.strftime('%m-%d-%Y')
     
-    # Create output directory
-    output_dir = 'Physics Seminars & Colloquia'
-    os.makedirs(output_dir, exist_ok=True)
+    # Output files carry the date range in their name (sanitized for Windows)
+    raw_html_filename = f"Physics Seminars & Colloquia | {start_display} - {end_display}.html"
+    html_path = os.path.join(output_dir, sanitize_filename(raw_html_filename))
+    raw_csv_filename = f"Physics Seminars & Colloquia | {start_display} - {end_display}.csv"
+    csv_path = os.path.join(output_dir, sanitize_filename(raw_csv_filename))
+    raw_ics_filename = f"Physics Seminars & Colloquia | {start_display} - {end_display}.ics"
+    ics_path = os.path.join(output_dir, sanitize_filename(raw_ics_filename))
+    
+    # Render all three formats in one pass over the events
+    with atomic_output(html_path) as html_file, \
+            atomic_output(csv_path, newline='') as csv_file, \
+            atomic_output(ics_path, newline='') as ics_file:
+        render_events(view, [
+            HtmlDigestWriter(html_file, view.start_date, view.end_date),
+            GoogleCalendarCsvWriter(csv_file),
+            IcsCalendarWriter(ics_file, view.start_date, view.end_date),
+        ])
+    return html_path, csv_path, ics_path
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    budget = TimeBudget(args.time_budget)
+    set_site_urls(args.events_base_url, args.lsa_base_url)
+    RATE_LIMITER.configure(args.requests_per_second, args.burst)
+    RETRY_POLICY.configure(args.max_attempts, args.max_backoff)
+    CIRCUIT_BREAKERS.configure(args.breaker_failures, args.breaker_cooldown)
+    HEDGER.configure(args.hedge_fraction, args.detail_workers)
+    # Hedged detail fetches run next to the ones they duplicate
+    detail_in_flight = args.detail_workers * (2 if args.hedge_fraction > 0 else 1)
+    CONCURRENCY_LIMITER.configure(max(args.feed_concurrency, detail_in_flight), not args.fixed_concurrency)
+    # The pipeline fetches feeds and detail pages at once, possibly from the same host
+    HTTP_CLIENTS.configure(args.feed_concurrency + detail_in_flight, http2=args.http2)
+    feed_cache = None
+    detail_cache = None
+    if not args.no_cache:
+        feed_cache = FeedCache(args.cache_dir, offline=args.offline)
+        detail_cache = DetailCache(args.cache_dir, ttl=args.detail_cache_ttl * 3600,
+                                   max_entries=args.detail_cache_size, offline=args.offline)
+    store = None if args.no_cache or args.full_refresh else EventStore(args.cache_dir)
+    feed_ids = args.feeds
+    fetch_options = {
+        'cache': detail_cache,
+        'extractor': resolve_detail_extractor(args.extractor),
+        'max_bytes': args.max_detail_bytes,
+        'early_abort': not args.full_detail_pages,
+        'deadline': args.request_deadline,
+    }
     
-    # Generate HTML
-    print("Generating HTML output...")
-    html_output = generate_html_output(all_events, start_date, end_date, output_dir)
+    if args.pipeline:
+        print_ranges(args.ranges)
+        print(f"Fetching {len(feed_ids)} RSS feeds and event details as a pipeline...\n")
+        with METRICS.phase('pipeline'):
+            all_events, views = run_pipeline(
+                feed_ids, args.ranges, feed_concurrency=args.feed_concurrency,
+                detail_workers=args.detail_workers, feed_cache=feed_cache, plan=not args.always_fetch_details,
+                store=store, queue_size=args.queue_size, budget=budget, **fetch_options)
+        print(f"Events within date range: {len(union_of_views(views))}")
+    else:
+        all_events, views = run_phased(args, feed_ids, feed_cache, fetch_options, store=store, budget=budget)
     
-    # Format date range for filenames
-    start_display = start_date.strftime('%m-%d-%Y')
-    end_display = end_date.strftime('%m-%d-%Y')
+    if store:
+        stats = store.stats
+        print(f"Event store: {stats['new']} new, {stats['changed']} changed, "
+              f"{stats['unchanged']} unchanged events in range")
+        store.save(all_events, union_of_views(views))
+        store.close()
     
-    # Save HTML file with date range in filename (sanitize for Windows)
-    raw_html_filename = f"Physics Seminars & Colloquia | {start_display} - {end_display}.html"
-    html_filename = sanitize_filename(raw_html_filename)
-    html_path = os.path.join(output_dir, html_filename)
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(html_output)
+    if detail_cache:
+        stats = detail_cache.stats
+        print(f"Detail cache: {stats['hits']} hits, {stats['revalidated']} revalidated, {stats['misses']} misses")
+        detail_cache.close()
     
-    print(f"HTML output saved to {html_path}")
+    if args.time_budget is not None:
+        METRICS.set_section('time_budget', {
+            'seconds': args.time_budget,
+            'remaining_seconds': budget.remaining(),
+            'events_without_details': budget.unenriched,
+        })
     
-    # Generate Google Calendar CSV
-    print("Generating Google Calendar CSV...")
-    raw_csv_filename = f"Physics Seminars & Colloquia | {start_display} - {end_display}.csv"
-    csv_filename = sanitize_filename(raw_csv_filename)
-    csv_path = os.path.join(output_dir, csv_filename)
-    generate_google_calendar_csv(all_events, start_date, end_date, csv_path)
-    print(f"CSV output saved to {csv_path}")
+    coalescing = DETAIL_FLIGHTS.report()
+    METRICS.set_section('coalescing', coalescing)
+    if coalescing['shared']:
+        print(f"Shared {coalescing['shared']} of {coalescing['calls']} detail fetches with an identical one in flight")
+    
+    if args.hedge_fraction > 0:
+        hedging = HEDGER.report()
+        METRICS.set_section('hedging', hedging)
+        print(f"Hedged {hedging['hedges']} of {hedging['calls']} detail fetches, "
+              f"{hedging['hedge_wins']} hedges finished first")
+    
+    concurrency = CONCURRENCY_LIMITER.report()
+    METRICS.set_section('concurrency', concurrency)
+    for host, limits in concurrency.items():
+        if limits['decreases']:
+            print(f"Concurrency limit for {host}: {limits['limit']} of {limits['max_limit']} "
+                  f"(lowest {limits['lowest_limit']}, {limits['decreases']} back-offs)")
+    
+    breakers = CIRCUIT_BREAKERS.report()
+    METRICS.set_section('circuit_breakers', breakers)
+    for host, breaker in breakers.items():
+        if breaker['trips']:
+            print(f"Circuit breaker for {host} opened {breaker['trips']} times, "
+                  f"{breaker['rejected']} requests refused")
+    
+    # Create output directory
+    output_dir = args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Render the HTML digest, Google Calendar CSV and iCalendar file of
+    # every range; each range is rendered in its own thread
+    print("Generating HTML output, Google Calendar CSV and iCalendar file...")
+    with METRICS.phase('render'):
+        with ThreadPoolExecutor(max_workers=min(len(views), os.cpu_count() or 1)) as executor:
+            for html_path, csv_path, ics_path in executor.map(partial(render_range, output_dir=output_dir), views):
+                print(f"HTML output saved to {html_path}")
+                print(f"CSV output saved to {csv_path}")
+                print(f"iCalendar output saved to {ics_path}")
+    
+    if args.metrics_json:
+        METRICS.write_json(args.metrics_json)
+        print(f"Run metrics saved to {args.metrics_json}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import iter_rss_items  # noqa: E402
+
+FEED = b'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:ev="http://purl.org/rss/1.0/modules/event/">
+  <channel>
+    <item>
+      <title>Colloquium</title>
+      <guid>101@events.umich.edu</guid>
+      <ev:startdate>2026-10-14T16:00:00-04:00</ev:startdate>
+    </item>
+    <item>
+      <title>Seminar</title>
+      <guid>102@events.umich.edu</guid>
+      <ev:startdate>2026-10-15T12:00:00-04:00</ev:startdate>
+    </item>
+  </channel>
+</rss>
+'''
+
+
+def hashes(chunks):
+    return [event.content_hash for event in iter_rss_items(chunks)]
+
+
+class ContentHashTest(unittest.TestCase):
+    def test_hash_does_not_depend_on_chunking(self):
+        whole = hashes([FEED])
+        for boundary in (FEED.index(b'</item>') + len(b'</item>'), FEED.rindex(b'</item>') + len(b'</item>')):
+            self.assertEqual(hashes([FEED[:boundary], FEED[boundary:]]), whole)
+        self.assertEqual(hashes([FEED[i:i + 7] for i in range(0, len(FEED), 7)]), whole)
+
+    def test_hash_changes_with_content(self):
+        changed = FEED.replace(b'<title>Seminar</title>', b'<title>Seminar (moved)</title>')
+        self.assertEqual(hashes([changed])[0], hashes([FEED])[0])
+        self.assertNotEqual(hashes([changed])[1], hashes([FEED])[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+BODY_SIZE = 20 * 1024
+
+
+class DripHandler(BaseHTTPRequestHandler):
+    """Sends a page 100 bytes at a time, every 0.1 s."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=UTF-8')
+        self.send_header('Content-Length', str(BODY_SIZE))
+        self.end_headers()
+        try:
+            for _ in range(BODY_SIZE // 100):
+                self.wfile.write(b'x' * 100)
+                self.wfile.flush()
+                time.sleep(0.1)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class DeadlineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), DripHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/page.html'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def assert_cut_short(self, http2):
+        main.HTTP_CLIENTS.configure(2, http2=http2)
+        started = time.perf_counter()
+        response = main.http_get(self.url, deadline=1.0, stream=True)
+        with self.assertRaises(main.DeadlineExceeded):
+            main.read_detail_page(response)
+        # Each 8 KiB read would take about 8 s of dripping
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+    def test_dripping_body_is_cut_at_the_deadline(self):
+        self.assert_cut_short(http2=False)
+
+    @unittest.skipIf(main.httpx is None, "httpx is not installed")
+    def test_dripping_body_is_cut_at_the_deadline_with_httpx(self):
+        self.assert_cut_short(http2=True)
+
+    def tearDown(self):
+        main.HTTP_CLIENTS.configure(10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import percentile  # noqa: E402
+
+
+class PercentileTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_median_is_lower_middle_for_even_sizes(self):
+        for n in (2, 6, 10):
+            self.assertEqual(percentile(list(range(1, n + 1)), 0.5), n // 2)
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 1.0), 100)
+        self.assertEqual(percentile(values, 0.0), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
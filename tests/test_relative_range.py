@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import parse_relative_range  # noqa: E402
+
+
+def utc(year, month, day):
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+class ParseRelativeRangeTest(unittest.TestCase):
+    # A Wednesday
+    TODAY = date(2026, 10, 14)
+
+    def parse(self, text):
+        return parse_relative_range(text, today=self.TODAY)
+
+    def test_today_and_tomorrow_cover_the_whole_day(self):
+        self.assertEqual(self.parse('today'), (utc(2026, 10, 14), utc(2026, 10, 15)))
+        self.assertEqual(self.parse('tomorrow'), (utc(2026, 10, 15), utc(2026, 10, 16)))
+
+    def test_weeks_run_monday_through_sunday(self):
+        self.assertEqual(self.parse('this week'), (utc(2026, 10, 12), utc(2026, 10, 19)))
+        self.assertEqual(self.parse('next week'), (utc(2026, 10, 19), utc(2026, 10, 26)))
+
+    def test_week_includes_sunday_evening(self):
+        start, end = self.parse('this week')
+        sunday_evening = utc(2026, 10, 18) + timedelta(hours=19)
+        self.assertTrue(start <= sunday_evening <= end)
+
+    def test_week_on_monday_and_sunday(self):
+        self.assertEqual(parse_relative_range('this week', today=date(2026, 10, 12))[0], utc(2026, 10, 12))
+        self.assertEqual(parse_relative_range('this week', today=date(2026, 10, 18))[0], utc(2026, 10, 12))
+
+    def test_next_and_last_n(self):
+        self.assertEqual(self.parse('next 14 days'), (utc(2026, 10, 14), utc(2026, 10, 28)))
+        self.assertEqual(self.parse('last 2 weeks'), (utc(2026, 9, 30), utc(2026, 10, 14)))
+        self.assertEqual(self.parse('  Next   3 Days '), (utc(2026, 10, 14), utc(2026, 10, 17)))
+
+    def test_unrecognised(self):
+        self.assertIsNone(self.parse('next fortnight'))
+
+
+if __name__ == '__main__':
+    unittest.main()